@@ -0,0 +1,100 @@
+"""Mautic REST access shared by the provisioning commands.
+
+Nothing here does work at import time: `.mautic_env` is loaded and
+`requests` is imported only when a command actually needs them.
+"""
+import os
+import sys
+import threading
+
+REQUEST_TIMEOUT = 30
+
+
+def load_env():
+    """Load .mautic_env into the environment if python-dotenv is available"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return False
+    load_dotenv('.mautic_env')
+    return True
+
+
+def require_settings(log, *names):
+    """Return the values of the given environment variables, exiting if any is unset"""
+    values = [os.getenv(name) for name in names]
+    missing = [name for name, value in zip(names, values) if not value]
+    if missing:
+        log.error(f"Missing required environment variables: {', '.join(missing)}. "
+                  "Please set them in your .mautic_env file")
+        sys.exit(1)
+    return values
+
+
+class MauticApi:
+    """Thin wrapper around the REST API; errors are logged and returned as None.
+
+    Safe to share between worker threads: each thread gets its own pooled session.
+    """
+
+    def __init__(self, url, user, password, log):
+        import requests
+
+        self._requests = requests
+        self.url = url.rstrip("/")
+        self.log = log
+        self.auth = (str(user), str(password))
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = self._requests.Session()
+            self._local.session.auth = self.auth
+        return self._local.session
+
+    @classmethod
+    def from_env(cls, log):
+        url, user, password = require_settings(log, "MAUTIC_URL", "MAUTIC_USER", "MAUTIC_PASSWORD")
+        return cls(url, user, password, log)
+
+    def request(self, endpoint, method="GET", data=None, timeout=REQUEST_TIMEOUT):
+        url = f"{self.url}/api/{endpoint}"
+        try:
+            response = self.session.request(method, url, json=data, timeout=timeout)
+            response.raise_for_status()
+            if response.text:
+                return response.json()
+            return None
+        except self._requests.exceptions.RequestException as e:
+            response_text = e.response.text if getattr(e, 'response', None) is not None else None
+            self.log.error(f"API Error: {e}", resource=endpoint, response=response_text)
+            return None
+
+    def find_id(self, endpoint, list_key, key, value):
+        """Return the ID of the first entity whose `key` equals `value`, or None"""
+        response = self.request(endpoint)
+        if not response or list_key not in response:
+            return None
+        entities = response[list_key]
+        if isinstance(entities, dict):
+            entities = entities.values()
+        for entity in entities:
+            if isinstance(entity, dict) and entity.get(key) == value:
+                return entity.get('id')
+        return None
+
+    def iter_entities(self, endpoint, list_key, page_size=100, query=""):
+        """Stream every entity of a list endpoint in ID order, one page at a time"""
+        start = 0
+        while True:
+            page = self.request(f"{endpoint}?start={start}&limit={page_size}&orderBy=id&orderByDir=ASC{query}")
+            if page is None:
+                raise RuntimeError(f"Failed to read {endpoint} page starting at {start}")
+            entities = page.get(list_key) or []
+            if isinstance(entities, dict):
+                entities = list(entities.values())
+            yield from entities
+            start += len(entities)
+            if len(entities) < page_size or start >= int(page.get("total", start)):
+                return
@@ -0,0 +1,285 @@
+"""`audit` command: compare deployed instances against the provisioned definitions.
+
+Each instance usually costs one searched list request per resource type, all
+issued through a single bounded thread pool; resources are compared as short fingerprints of
+their normalized definitions.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from urllib.parse import quote
+
+from mautic_definitions import (
+    CAMPAIGN_NAME, EMAIL_CATEGORY_NAME, EMAIL_SEQUENCE, FORM_NAME, PROFISSAO_FIELD, SEGMENT,
+    TAG_NAME, build_campaign, build_form,
+)
+
+DEFAULT_WORKERS = 16
+REQUEST_TIMEOUT = 15
+FINGERPRINT_LENGTH = 12
+PAGE_SIZE = 100
+
+# Word shared by the names of the welcome email sequence
+EMAIL_SEARCH = "Superare"
+
+# One list request per resource type and instance in the usual case; `search` keeps the
+# result to a page, and fetch_resource follows `total` when it does not.
+ENDPOINTS = {
+    "fields": (f"fields/contact?search={quote(PROFISSAO_FIELD['alias'])}", "fields"),
+    "categories": (f"categories?type=email&search={quote(EMAIL_CATEGORY_NAME)}", "categories"),
+    "emails": (f"emails?search={EMAIL_SEARCH}", "emails"),
+    "tags": (f"tags?search={quote(TAG_NAME)}", "tags"),
+    "segments": (f"segments?search={quote(SEGMENT['alias'])}", "lists"),
+    "campaigns": (f"campaigns?search={quote(CAMPAIGN_NAME)}", "campaigns"),
+    "forms": (f"forms?search={quote(FORM_NAME)}", "forms"),
+}
+
+
+# --- Fingerprints ---
+def fingerprint(normalized):
+    canonical = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def normalize_html(html):
+    return re.sub(r"\s+", " ", html or "").strip()
+
+
+def normalize_options(options):
+    # Mautic returns select options either as a list of dicts or as "a|b|c"
+    if isinstance(options, str):
+        return [[option, option] for option in options.split("|") if option]
+    if isinstance(options, dict):
+        options = options.get("list", [])
+    return [[option.get("label"), option.get("value")] for option in options or []]
+
+
+def ref_id(value):
+    if isinstance(value, dict):
+        return value.get("id")
+    return value
+
+
+def normalize_field(field):
+    return {
+        "label": field.get("label"),
+        "type": field.get("type"),
+        "options": normalize_options((field.get("properties") or {}).get("list")),
+    }
+
+
+def normalize_email(email, category_title):
+    return {
+        "subject": email.get("subject"),
+        "content": normalize_html(email.get("customHtml") or email.get("content")),
+        "isPublished": bool(email.get("isPublished")),
+        "category": category_title,
+    }
+
+
+def normalize_segment(segment):
+    return {"alias": segment.get("alias"), "isPublished": bool(segment.get("isPublished"))}
+
+
+def normalize_campaign(campaign, email_names):
+    events = campaign.get("events") or []
+    if isinstance(events, dict):
+        events = list(events.values())
+    return {
+        "isPublished": bool(campaign.get("isPublished")),
+        "events": sorted(
+            [event.get("type"), email_names.get(str(ref_id((event.get("properties") or {}).get("email"))))]
+            for event in events
+        ),
+    }
+
+
+def normalize_form(form, campaign_names):
+    actions = []
+    for action in form.get("actions") or []:
+        properties = action.get("properties") or {}
+        campaign = properties.get("campaign", properties.get("addTo"))
+        campaigns = campaign if isinstance(campaign, list) else [campaign] if campaign is not None else []
+        actions.append([
+            action.get("type"),
+            sorted(campaign_names.get(str(ref_id(c)), str(ref_id(c))) for c in campaigns),
+            sorted(properties.get("tags") or properties.get("add_tags") or []),
+        ])
+    return {
+        "alias": form.get("alias"),
+        "isPublished": bool(form.get("isPublished")),
+        "fields": [
+            [field.get("alias"), field.get("type"), bool(field.get("isRequired"))]
+            for field in form.get("fields") or []
+        ],
+        "actions": sorted(actions),
+    }
+
+
+def expected_fingerprints():
+    """Fingerprints of the resources as the `create` command provisions them"""
+    expected = {f"field:{PROFISSAO_FIELD['alias']}": fingerprint(normalize_field(PROFISSAO_FIELD))}
+    for email in EMAIL_SEQUENCE:
+        expected[f"email:{email['name']}"] = fingerprint(normalize_email(email, EMAIL_CATEGORY_NAME))
+    expected[f"tag:{TAG_NAME}"] = fingerprint({"tag": TAG_NAME})
+    expected[f"segment:{SEGMENT['name']}"] = fingerprint(normalize_segment(SEGMENT))
+    first_email = EMAIL_SEQUENCE[0]["name"]
+    expected[f"campaign:{CAMPAIGN_NAME}"] = fingerprint(
+        normalize_campaign(build_campaign(None, first_email), {first_email: first_email})
+    )
+    expected[f"form:{FORM_NAME}"] = fingerprint(
+        normalize_form(build_form(CAMPAIGN_NAME), {CAMPAIGN_NAME: CAMPAIGN_NAME})
+    )
+    return expected
+
+
+def actual_fingerprints(resources):
+    """Fingerprints of the matching resources fetched from one instance"""
+    category_titles = {str(c.get("id")): c.get("title") for c in resources["categories"]}
+    email_names = {str(e.get("id")): e.get("name") for e in resources["emails"]}
+    campaign_names = {str(c.get("id")): c.get("name") for c in resources["campaigns"]}
+
+    actual = {}
+    for field in resources["fields"]:
+        if field.get("alias") == PROFISSAO_FIELD["alias"]:
+            actual[f"field:{field['alias']}"] = fingerprint(normalize_field(field))
+    expected_emails = {email["name"] for email in EMAIL_SEQUENCE}
+    for email in resources["emails"]:
+        if email.get("name") in expected_emails:
+            category = email.get("category")
+            title = category.get("title") if isinstance(category, dict) else category_titles.get(str(category))
+            actual[f"email:{email['name']}"] = fingerprint(normalize_email(email, title))
+    for tag in resources["tags"]:
+        if tag.get("tag") == TAG_NAME:
+            actual[f"tag:{TAG_NAME}"] = fingerprint({"tag": TAG_NAME})
+    for segment in resources["segments"]:
+        if segment.get("name") == SEGMENT["name"]:
+            actual[f"segment:{segment['name']}"] = fingerprint(normalize_segment(segment))
+    for campaign in resources["campaigns"]:
+        if campaign.get("name") == CAMPAIGN_NAME:
+            actual[f"campaign:{CAMPAIGN_NAME}"] = fingerprint(normalize_campaign(campaign, email_names))
+    for form in resources["forms"]:
+        if form.get("name") == FORM_NAME:
+            actual[f"form:{FORM_NAME}"] = fingerprint(normalize_form(form, campaign_names))
+    return actual
+
+
+# --- Fetching ---
+def load_instances(path, log):
+    """Read the fleet file: a JSON list of {"tenant", "url", "user", "password"}.
+
+    `user` and `password` may be given as "$VAR" to read them from the environment.
+    Without a fleet file the instance from MAUTIC_URL/MAUTIC_USER/MAUTIC_PASSWORD is audited.
+    """
+    if not path:
+        url = os.getenv("MAUTIC_URL")
+        if not all([url, os.getenv("MAUTIC_USER"), os.getenv("MAUTIC_PASSWORD")]):
+            log.error("Missing required environment variables. Please set MAUTIC_URL, MAUTIC_USER, and MAUTIC_PASSWORD")
+            sys.exit(1)
+        return [{"tenant": None, "url": url, "user": os.getenv("MAUTIC_USER"), "password": os.getenv("MAUTIC_PASSWORD")}]
+    with open(path, encoding="utf-8") as f:
+        instances = json.load(f)
+    for instance in instances:
+        for key in ("user", "password"):
+            value = instance.get(key) or ""
+            if value.startswith("$"):
+                instance[key] = os.getenv(value[1:])
+    return instances
+
+
+def fetch_resource(session, instance, resource):
+    endpoint, list_key = ENDPOINTS[resource]
+    auth = (str(instance["user"]), str(instance["password"]))
+    entities = []
+    while True:
+        url = f"{instance['url'].rstrip('/')}/api/{endpoint}&start={len(entities)}&limit={PAGE_SIZE}"
+        response = session.get(url, auth=auth, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        page = response.json()
+        page_entities = page.get(list_key) or []
+        if isinstance(page_entities, dict):
+            page_entities = list(page_entities.values())
+        entities.extend(page_entities)
+        if len(page_entities) < PAGE_SIZE or len(entities) >= int(page.get("total", 0)):
+            return entities
+
+
+def audit(instances, workers):
+    """Fetch every (instance, resource) pair through one bounded pool and diff the fingerprints"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests
+
+    expected = expected_fingerprints()
+    sessions = {instance["url"]: requests.Session() for instance in instances}
+    # Size each session's pool to the bounded worker count so connections are reused
+    for session in sessions.values():
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    jobs = [(instance, resource) for instance in instances for resource in ENDPOINTS]
+
+    def run(job):
+        instance, resource = job
+        try:
+            return fetch_resource(sessions[instance["url"]], instance, resource), None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return None, f"{resource}: {e}"
+
+    fetched = {instance["url"]: {} for instance in instances}
+    errors = {instance["url"]: [] for instance in instances}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (instance, resource), (entities, error) in zip(jobs, executor.map(run, jobs)):
+            if error:
+                errors[instance["url"]].append(error)
+            else:
+                fetched[instance["url"]][resource] = entities
+
+    report = []
+    for instance in instances:
+        tenant = instance.get("tenant") or instance["url"]
+        if errors[instance["url"]]:
+            # Every request to a down instance fails the same way; the first error is enough
+            report.append({"tenant": tenant, "status": "unreachable", "error": errors[instance["url"]][0]})
+            continue
+        actual = actual_fingerprints(fetched[instance["url"]])
+        drift = {}
+        for key, expected_fp in expected.items():
+            actual_fp = actual.get(key)
+            if actual_fp is None:
+                drift[key] = "missing"
+            elif actual_fp != expected_fp:
+                drift[key] = f"changed {expected_fp}->{actual_fp}"
+        report.append({"tenant": tenant, "status": "drift" if drift else "ok", "drift": drift})
+    return report
+
+
+def run(args, log):
+    instances = load_instances(args.instances, log)
+    start = time.perf_counter()
+    report = audit(instances, args.workers or DEFAULT_WORKERS)
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    for entry in report:
+        if entry["status"] == "ok":
+            log.info("✅ No drift", resource=entry["tenant"])
+        elif entry["status"] == "drift":
+            log.warning("⚠️ Configuration drift", resource=entry["tenant"], drift=entry["drift"])
+        else:
+            log.error("❌ Instance unreachable", resource=entry["tenant"], error=entry["error"])
+    summary = {status: sum(1 for entry in report if entry["status"] == status) for status in ("ok", "drift", "unreachable")}
+    log.info("Drift audit finished", instances=len(report), duration_ms=duration_ms, **summary)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if summary["unreachable"]:
+        return 2
+    if summary["drift"]:
+        return 1
+    return 0
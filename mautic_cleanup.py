@@ -0,0 +1,37 @@
+"""`cleanup` command: delete the resources created by the `create` command."""
+from mautic_api import MauticApi
+from mautic_definitions import CAMPAIGN_NAME, EMAIL_SEQUENCE, FORM_NAME, PROFISSAO_FIELD, TAG_NAME
+
+# step -> [(resource label, endpoint, list key, natural key, value)]
+DELETION_STEPS = {
+    "delete_custom_field": [
+        (f"field:{PROFISSAO_FIELD['alias']}", "fields/contact", "fields", "alias", PROFISSAO_FIELD["alias"]),
+    ],
+    "delete_emails": [
+        (f"email:{email['name']}", "emails", "emails", "name", email["name"]) for email in EMAIL_SEQUENCE
+    ],
+    "delete_campaign": [(f"campaign:{CAMPAIGN_NAME}", "campaigns", "campaigns", "name", CAMPAIGN_NAME)],
+    "delete_tag": [(f"tag:{TAG_NAME}", "tags", "tags", "tag", TAG_NAME)],
+    "delete_form": [(f"form:{FORM_NAME}", "forms", "forms", "name", FORM_NAME)],
+}
+
+
+def run(args, log):
+    api = MauticApi.from_env(log)
+    failed = 0
+    for step, deletions in DELETION_STEPS.items():
+        with log.step(step):
+            for resource, endpoint, list_key, key, value in deletions:
+                resource_id = api.find_id(endpoint, list_key, key, value)
+                if not resource_id:
+                    log.info("Does not exist.", resource=resource)
+                    continue
+                del_result = api.request(f"{endpoint}/{resource_id}/delete", method="DELETE")
+                if del_result is not None:
+                    log.info("✅ Deleted.", resource=resource)
+                else:
+                    failed += 1
+                    log.error("❌ Failed to delete.", resource=resource)
+    # Failed deletions are reported but, as before, do not fail the run
+    log.info("Cleanup finished", failed=failed)
+    return 0
@@ -0,0 +1,173 @@
+"""Single entry point for the Mautic provisioning commands.
+
+    python mautic_cli.py [-v|-q] {create,cleanup,test-email,audit,segments-update,snapshot,
+                                  webhook-serve,webhook-bench,startup-check} ...
+
+Deploy hooks invoke this hundreds of times, so importing it and parsing the
+arguments must stay cheap: each command's module, `requests`, python-dotenv
+and the logging sink are only loaded once a command actually runs. The
+`startup-check` command measures this against STARTUP_BUDGET_MS.
+"""
+import argparse
+import sys
+
+# command -> (module exposing run(args, log), help)
+COMMANDS = {
+    "create": ("mautic_create", "Create the Semente1 field, emails, tag, segment, campaign and form"),
+    "cleanup": ("mautic_cleanup", "Delete the resources created by `create`"),
+    "test-email": ("mautic_test_email", "Send a test email to verify the SendGrid configuration"),
+    "audit": ("mautic_audit", "Report configuration drift across deployed instances"),
+    "segments-update": ("mautic_segments", "Rebuild only the segments affected by contact changes"),
+    "snapshot": ("mautic_snapshot", "Export or import a snapshot of a tenant's marketing assets"),
+    "webhook-serve": ("mautic_webhooks", "Receive Mautic webhooks, spool them and forward them downstream in batches"),
+    "webhook-bench": ("mautic_webhooks", "Measure webhook receiver throughput against an in-process instance"),
+}
+
+GLOBAL_FLAGS = ("-v", "--verbose", "-q", "--quiet")
+
+# Budget for `import mautic_cli` plus building the parser in a fresh interpreter,
+# excluding the interpreter's own startup.
+STARTUP_BUDGET_MS = 25
+
+# Modules that must not be loaded before a command runs
+LAZY_MODULES = ("requests", "urllib3", "dotenv", "pymysql", "json", "logging.handlers", "concurrent.futures",
+                "asyncio", "mautic_logging", "mautic_api", "mautic_definitions")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="mautic_cli.py", description="Mautic provisioning commands")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    verbosity.add_argument("-q", "--quiet", action="store_true", help="Only log warnings and errors")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create = subparsers.add_parser("create", help=COMMANDS["create"][1])
+    create.add_argument("--read-backend", choices=("api", "db"),
+                        help="Resolve existing resources through the API or MySQL (default: MAUTIC_READ_BACKEND or api)")
+
+    subparsers.add_parser("cleanup", help=COMMANDS["cleanup"][1])
+    subparsers.add_parser("test-email", help=COMMANDS["test-email"][1])
+
+    audit = subparsers.add_parser("audit", help=COMMANDS["audit"][1])
+    audit.add_argument("--instances", help="JSON fleet file (defaults to the MAUTIC_* instance)")
+    audit.add_argument("--workers", type=int, help="Maximum concurrent API requests across the fleet (default 16)")
+    audit.add_argument("--report", help="Also write the drift report to this JSON file")
+
+    segments = subparsers.add_parser("segments-update", help=COMMANDS["segments-update"][1])
+    segments.add_argument("--list-id", type=int, action="append", default=[],
+                          help="Restrict to this segment ID (may be repeated)")
+    segments.add_argument("--state-file", default="segment-update-state.json",
+                          help="JSON file holding the high-water marks and run history")
+    segments.add_argument("--console", help="Command used to invoke bin/console (default: MAUTIC_CONSOLE or "
+                                            "`docker compose exec -T mautic_cron php /var/www/html/bin/console`)")
+    segments.add_argument("--memory-limit",
+                          help="Memory available to the console (e.g. 256M); defaults to the mautic_cron limit")
+    segments.add_argument("--batch-limit", type=int, help="Override the batch limit derived from --memory-limit")
+    segments.add_argument("--full", action="store_true", help="Rebuild every selected segment regardless of changes")
+    segments.add_argument("--dry-run", action="store_true", help="Log the console commands without running them")
+
+    snapshot = subparsers.add_parser("snapshot", help=COMMANDS["snapshot"][1])
+    snapshot.add_argument("--url", help="Mautic URL (defaults to MAUTIC_URL)")
+    snapshot.add_argument("--user", help="Mautic user (defaults to MAUTIC_USER)")
+    snapshot.add_argument("--password", help="Mautic password (defaults to MAUTIC_PASSWORD)")
+    actions = snapshot.add_subparsers(dest="action", required=True)
+    export = actions.add_parser("export", help="Write the instance's assets to a snapshot")
+    export.add_argument("snapshot", help="Output file (gzip-compressed JSON lines)")
+    export.add_argument("--resource", action="append",
+                        choices=("fields", "categories", "tags", "segments", "emails", "campaigns", "forms"),
+                        help="Only export this resource (may be repeated)")
+    load = actions.add_parser("import", help="Recreate a snapshot's assets on the instance")
+    load.add_argument("snapshot", help="Snapshot written by the export command")
+    load.add_argument("--workers", type=int, help="Parallel write requests (default 4)")
+    load.add_argument("--id-map", help="Write the source-to-target ID mapping to this JSON file")
+
+    for name in ("webhook-serve", "webhook-bench"):
+        webhook = subparsers.add_parser(name, help=COMMANDS[name][1])
+        webhook.add_argument("--batch-size", type=int, default=500, help="Events per downstream request")
+        webhook.add_argument("--batch-wait", type=float, default=1.0,
+                             help="Seconds to let a partial batch fill before sending it")
+        webhook.add_argument("--max-pending", type=int, default=100_000,
+                             help="Undelivered events before the receiver answers 503")
+        webhook.add_argument("--path", default="/webhooks/mautic", help="URL path Mautic posts to")
+        if name == "webhook-serve":
+            webhook.add_argument("--host", default="0.0.0.0", help="Listen address")
+            webhook.add_argument("--port", type=int, default=8088, help="Listen port")
+            webhook.add_argument("--spool-dir", default="webhook-spool", help="Directory for the durable queue")
+            webhook.add_argument("--secret", help="Webhook secret (default: MAUTIC_WEBHOOK_SECRET)")
+            webhook.add_argument("--downstream",
+                                 help="URL to POST batches to, or file:PATH (default: WEBHOOK_DOWNSTREAM_URL)")
+        else:
+            webhook.add_argument("--requests", type=int, default=20_000, help="Webhooks to send")
+            webhook.add_argument("--concurrency", type=int, default=50, help="Concurrent keep-alive connections")
+
+    startup = subparsers.add_parser("startup-check", help="Measure CLI import and parse time against the budget")
+    startup.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    startup.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="Allowed median time")
+    return parser
+
+
+def startup_check(args, log):
+    """Time `import mautic_cli` + build_parser() in fresh interpreters and check nothing heavy was loaded"""
+    import os
+    import statistics
+    import subprocess
+
+    probe = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import mautic_cli\n"
+        "mautic_cli.build_parser()\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "print(elapsed)\n"
+        "print(','.join(m for m in mautic_cli.LAZY_MODULES if m in sys.modules))\n"
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    loaded = set()
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=here, capture_output=True, text=True, check=True)
+        elapsed, modules = (output.stdout.splitlines() + [""])[:2]
+        timings.append(float(elapsed))
+        loaded.update(filter(None, modules.split(",")))
+
+    median_ms = round(statistics.median(timings), 2)
+    within_budget = median_ms <= args.budget_ms and not loaded
+    log_call = log.info if within_budget else log.error
+    log_call("Startup check", median_ms=median_ms, budget_ms=args.budget_ms,
+             runs=[round(t, 2) for t in timings], eagerly_loaded=sorted(loaded))
+    return 0 if within_budget else 1
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    from mautic_api import load_env
+    from mautic_logging import get_logger, set_verbosity
+
+    dotenv_loaded = load_env()
+    log = get_logger(args.command)
+    if args.verbose:
+        set_verbosity("DEBUG")
+    elif args.quiet:
+        set_verbosity("WARNING")
+    if not dotenv_loaded:
+        log.warning("python-dotenv not installed. Loading environment from system variables.")
+
+    if args.command == "startup-check":
+        return startup_check(args, log)
+
+    import importlib
+
+    module = importlib.import_module(COMMANDS[args.command][0])
+    return module.run(args, log)
+
+
+def run_command(command, argv=None):
+    """Entry point for the per-command scripts, which accept the global flags anywhere"""
+    argv = sys.argv[1:] if argv is None else argv
+    flags = [arg for arg in argv if arg in GLOBAL_FLAGS]
+    return main(flags + [command] + [arg for arg in argv if arg not in GLOBAL_FLAGS])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
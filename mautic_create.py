@@ -0,0 +1,149 @@
+"""`create` command: provision the Semente1 lead capture flow.
+
+Creates the `profissao` field, the email category and welcome sequence, the
+Semente1 tag and segment, the LancamentoSemente1 campaign and the
+LeadLandingPageForm. Resources that already exist are reused, so the command
+can be re-run safely.
+"""
+import os
+import sys
+
+from mautic_api import MauticApi
+from mautic_definitions import (
+    CAMPAIGN_NAME, EMAIL_CATEGORY_NAME, EMAIL_SEQUENCE, FORM_ALIAS, FORM_NAME, PROFISSAO_FIELD, SEGMENT,
+    TAG_NAME, build_campaign, build_form,
+)
+
+
+class Resolver:
+    """Name lookups, served by the MySQL read path when MAUTIC_READ_BACKEND=db
+
+    If the database cannot be reached (or a query fails) the remaining lookups
+    fall back to the API instead of aborting the run.
+    """
+
+    def __init__(self, api, db_reader=None, log=None):
+        self.api = api
+        self.db = db_reader
+        self.log = log
+
+    def _lookup(self, db_lookup, value, endpoint, list_key, field):
+        if self.db:
+            try:
+                return getattr(self.db, db_lookup)(value)
+            except self.db.errors as e:
+                if self.log:
+                    self.log.warning(f"⚠️ MySQL lookup failed, using the API instead: {e}", resource=f"{list_key}:{value}")
+                self.db.close()
+                self.db = None
+        return self.api.find_id(endpoint, list_key, field, value)
+
+    def field_id(self, alias):
+        return self._lookup("field_id_by_alias", alias, "fields/contact", "fields", "alias")
+
+    def email_category_id(self, title):
+        return self._lookup("email_category_id_by_name", title, "categories?type=email", "categories", "title")
+
+    def email_id(self, name):
+        return self._lookup("email_id_by_name", name, "emails", "emails", "name")
+
+    def tag_id(self, tag):
+        return self._lookup("tag_id_by_name", tag, "tags", "tags", "tag")
+
+    def segment_id(self, name):
+        return self._lookup("segment_id_by_name", name, "segments", "lists", "name")
+
+    def campaign_id(self, name):
+        return self._lookup("campaign_id_by_name", name, "campaigns", "campaigns", "name")
+
+    def form_id(self, name):
+        return self._lookup("form_id_by_name", name, "forms", "forms", "name")
+
+
+def ensure(api, log, resource, existing_id, endpoint, entity_key, payload):
+    """Return the ID of an existing resource, or create it; exits if creation fails"""
+    if existing_id:
+        log.info("Already exists", resource=resource, id=existing_id)
+        return existing_id
+    result = api.request(f"{endpoint}/new", "POST", payload)
+    if not result:
+        log.error("❌ Failed to create", resource=resource)
+        sys.exit(1)
+    new_id = result.get(entity_key, {}).get('id')
+    log.info("✅ Created", resource=resource, id=new_id)
+    log.debug("Created entity", resource=resource, entity=result)
+    return new_id
+
+
+def run(args, log):
+    api = MauticApi.from_env(log)
+    log.info("Using Mautic instance", url=api.url)
+
+    db_reader = None
+    if (args.read_backend or os.getenv("MAUTIC_READ_BACKEND", "api")).lower() == "db":
+        from mautic_db import reader_from_env
+
+        try:
+            db_reader = reader_from_env(force=True)
+        except RuntimeError as e:
+            log.error(f"❌ {e}")
+            sys.exit(1)
+    resolve = Resolver(api, db_reader, log)
+
+    with log.step("custom_fields"):
+        alias = PROFISSAO_FIELD["alias"]
+        ensure(api, log, f"field:{alias}", resolve.field_id(alias), "fields/contact", "field", PROFISSAO_FIELD)
+
+    with log.step("email_category"):
+        email_category_id = ensure(
+            api, log, f"category:{EMAIL_CATEGORY_NAME}", resolve.email_category_id(EMAIL_CATEGORY_NAME),
+            "categories", "category", {"title": EMAIL_CATEGORY_NAME, "bundle": "email"},
+        )
+
+    with log.step("emails"):
+        email_ids = [
+            ensure(
+                api, log, f"email:{email['name']}", resolve.email_id(email["name"]),
+                "emails", "email", dict(email, category=email_category_id),
+            )
+            for email in EMAIL_SEQUENCE
+        ]
+
+    with log.step("tag"):
+        tag_id = ensure(api, log, f"tag:{TAG_NAME}", resolve.tag_id(TAG_NAME), "tags", "tag", {"tag": TAG_NAME})
+
+    with log.step("segment"):
+        segment_id = ensure(
+            api, log, f"segment:{SEGMENT['name']}", resolve.segment_id(SEGMENT["name"]), "segments", "list", SEGMENT,
+        )
+
+    with log.step("campaign"):
+        campaign_id = ensure(
+            api, log, f"campaign:{CAMPAIGN_NAME}", resolve.campaign_id(CAMPAIGN_NAME),
+            "campaigns", "campaign", build_campaign(segment_id, email_ids[0]),
+        )
+
+    with log.step("form"):
+        form_id = ensure(
+            api, log, f"form:{FORM_NAME}", resolve.form_id(FORM_NAME), "forms", "form", build_form(campaign_id),
+        )
+
+    if db_reader:
+        db_reader.close()
+
+    log.info("Form fields mapped to contact fields", field_mapping={
+        "firstname": "contact.firstname",
+        "email": "contact.email",
+        "mobile": "contact.mobile",
+        "country_code": "custom field (country code)",
+        "profissao": "custom field (profession)",
+    })
+    log.info(
+        "✅ Setup completed successfully!",
+        form_url=f"{api.url}/form/{FORM_ALIAS}",
+        campaign={"name": CAMPAIGN_NAME, "id": campaign_id},
+        form={"name": FORM_NAME, "id": form_id},
+        tag={"name": TAG_NAME, "id": tag_id},
+        emails=dict(zip(("D+0", "D+1", "D+2"), email_ids)),
+    )
+    return 0
@@ -0,0 +1,220 @@
+"""Read-only MySQL lookups against the Mautic `db` service.
+
+The REST API paginates and hydrates full entities, which makes name lookups
+slow on big instances and loads the mautic_web container. This module answers
+the same lookups with one query each over a small connection pool. Writes
+always go through the API.
+
+Names are compared byte for byte, like the API resolvers' `==`, rather than
+with MySQL's case- and trailing-space-insensitive collation. Mautic indexes tag
+names, field aliases and segment memberships; email, campaign and form names
+are not indexed, so those lookups scan tables that hold at most a few hundred
+rows.
+
+Enable it with MAUTIC_READ_BACKEND=db. Connection settings come from the
+MYSQL_HOST, MYSQL_PORT, MYSQL_DATABASE, MYSQL_USER and MYSQL_PASSWORD
+variables in `.env` (used by docker-compose.yml), falling back to the
+MAUTIC_DB_* ones in `.mautic_env`; set MAUTIC_DB_TABLE_PREFIX if the instance
+was installed with a table prefix. Requires PyMySQL.
+
+Run `python mautic_db.py` to compare every lookup against the API resolver.
+"""
+import contextlib
+import os
+import queue
+import threading
+
+DEFAULT_POOL_SIZE = 4
+CONNECT_TIMEOUT = 5
+
+
+class MauticDbReader:
+    """Read-only lookups returning the same IDs as the API resolvers"""
+
+    def __init__(self, host, port, database, user, password, table_prefix="", pool_size=DEFAULT_POOL_SIZE):
+        # Imported here so the API-only path never pays for loading PyMySQL
+        try:
+            import pymysql
+        except ImportError:
+            raise RuntimeError("PyMySQL is not installed; run `pip install -r requirements.txt`")
+        self._pymysql = pymysql
+        # Raised for unreachable servers and failed queries alike
+        self.errors = pymysql.MySQLError
+        self._connect_args = {
+            "host": host,
+            "port": int(port),
+            "database": database,
+            "user": user,
+            "password": password,
+            "charset": "utf8mb4",
+            "autocommit": True,
+            "connect_timeout": CONNECT_TIMEOUT,
+        }
+        self.prefix = table_prefix
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _connect(self):
+        connection = self._pymysql.connect(**self._connect_args)
+        with connection.cursor() as cursor:
+            cursor.execute("SET SESSION TRANSACTION READ ONLY")
+        return connection
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a pooled connection, opening one lazily if the pool is empty"""
+        with self._slots:
+            try:
+                connection = self._pool.get_nowait()
+                connection.ping(reconnect=True)
+            except queue.Empty:
+                connection = self._connect()
+            try:
+                yield connection
+            except Exception:
+                connection.close()
+                raise
+            else:
+                self._pool.put_nowait(connection)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _scalar(self, sql, params):
+        with self.connection() as connection, connection.cursor() as cursor:
+            cursor.execute(sql.format(prefix=self.prefix), params)
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _id_by(self, table, column, value, extra_where=""):
+        # The collated comparison can use an index on `column`; the binary one makes the match
+        # exact (case and trailing spaces), as the API resolvers compare with ==.
+        # They return the first match in ID order; ORDER BY id LIMIT 1 keeps parity.
+        return self._scalar(
+            f"SELECT id FROM {{prefix}}{table} WHERE {column} = %s AND CAST({column} AS BINARY) = CAST(%s AS BINARY)"
+            f"{extra_where} ORDER BY id LIMIT 1",
+            (value, value),
+        )
+
+    def field_id_by_alias(self, alias):
+        return self._id_by("lead_fields", "alias", alias, " AND object = 'lead'")
+
+    def email_category_id_by_name(self, title):
+        return self._id_by("categories", "title", title, " AND bundle = 'email'")
+
+    def email_id_by_name(self, name):
+        return self._id_by("emails", "name", name)
+
+    def tag_id_by_name(self, tag):
+        return self._id_by("lead_tags", "tag", tag)
+
+    def segment_id_by_name(self, name):
+        return self._id_by("lead_lists", "name", name)
+
+    def campaign_id_by_name(self, name):
+        return self._id_by("campaigns", "name", name)
+
+    def form_id_by_name(self, name):
+        return self._id_by("forms", "name", name)
+
+    def count_segment_members(self, segment_id):
+        # Covered by the (leadlist_id, lead_id) primary key; manually removed contacts are not members
+        return self._scalar(
+            "SELECT COUNT(*) FROM {prefix}lead_lists_leads WHERE leadlist_id = %s AND manually_removed = 0",
+            (segment_id,),
+        )
+
+
+def db_setting(name, default=None):
+    """MYSQL_<name> from .env, falling back to MAUTIC_DB_<name> from .mautic_env"""
+    return os.getenv(f"MYSQL_{name}") or os.getenv(f"MAUTIC_DB_{name}") or default
+
+
+def reader_from_env(force=False):
+    """Return a reader when MAUTIC_READ_BACKEND=db (or `force`), otherwise None (use the API)"""
+    if not force and os.getenv("MAUTIC_READ_BACKEND", "api").lower() != "db":
+        return None
+    # The compose `.env` holds the MYSQL_* settings; the commands only load .mautic_env
+    try:
+        from dotenv import load_dotenv
+        load_dotenv('.env')
+    except ImportError:
+        pass
+    missing = [name for name in ("DATABASE", "USER", "PASSWORD") if not db_setting(name)]
+    if missing:
+        raise RuntimeError(f"Missing database settings: {', '.join(f'MYSQL_{name}' for name in missing)}")
+    return MauticDbReader(
+        host=db_setting("HOST", "127.0.0.1"),
+        port=db_setting("PORT", "3306"),
+        database=db_setting("DATABASE"),
+        user=db_setting("USER"),
+        password=db_setting("PASSWORD"),
+        table_prefix=os.getenv("MAUTIC_DB_TABLE_PREFIX", ""),
+        pool_size=int(os.getenv("MYSQL_POOL_SIZE", DEFAULT_POOL_SIZE)),
+    )
+
+
+def _compare_with_api():
+    """Run each lookup through the API and the database, check they agree and time both"""
+    import time
+
+    import requests
+
+    from mautic_definitions import (
+        CAMPAIGN_NAME, EMAIL_CATEGORY_NAME, EMAIL_SEQUENCE, FORM_NAME, PROFISSAO_FIELD, SEGMENT, TAG_NAME,
+    )
+    from mautic_api import load_env
+    from mautic_logging import get_logger
+
+    load_env()
+    log = get_logger("mautic-db")
+    reader = reader_from_env(force=True)
+    session = requests.Session()
+    session.auth = (str(os.getenv("MAUTIC_USER")), str(os.getenv("MAUTIC_PASSWORD")))
+    base_url = f"{os.getenv('MAUTIC_URL')}/api"
+
+    def api_lookup(endpoint, list_key, key, value):
+        entities = session.get(f"{base_url}/{endpoint}", timeout=30).json().get(list_key) or []
+        if isinstance(entities, dict):
+            entities = entities.values()
+        return next((entity.get("id") for entity in entities if entity.get(key) == value), None)
+
+    def api_segment_members(alias):
+        response = session.get(f"{base_url}/contacts?search=segment:{alias}&limit=1&minimal=true", timeout=30)
+        return int(response.json().get("total", 0))
+
+    lookups = [
+        ("field", lambda: api_lookup("fields/contact", "fields", "alias", PROFISSAO_FIELD["alias"]),
+         lambda: reader.field_id_by_alias(PROFISSAO_FIELD["alias"])),
+        ("category", lambda: api_lookup("categories?type=email", "categories", "title", EMAIL_CATEGORY_NAME),
+         lambda: reader.email_category_id_by_name(EMAIL_CATEGORY_NAME)),
+        ("email", lambda: api_lookup("emails", "emails", "name", EMAIL_SEQUENCE[0]["name"]),
+         lambda: reader.email_id_by_name(EMAIL_SEQUENCE[0]["name"])),
+        ("tag", lambda: api_lookup("tags", "tags", "tag", TAG_NAME), lambda: reader.tag_id_by_name(TAG_NAME)),
+        ("segment", lambda: api_lookup("segments", "lists", "name", SEGMENT["name"]),
+         lambda: reader.segment_id_by_name(SEGMENT["name"])),
+        ("campaign", lambda: api_lookup("campaigns", "campaigns", "name", CAMPAIGN_NAME),
+         lambda: reader.campaign_id_by_name(CAMPAIGN_NAME)),
+        ("form", lambda: api_lookup("forms", "forms", "name", FORM_NAME), lambda: reader.form_id_by_name(FORM_NAME)),
+        ("segment_members", lambda: api_segment_members(SEGMENT["alias"]),
+         lambda: reader.count_segment_members(reader.segment_id_by_name(SEGMENT["name"]))),
+    ]
+    for name, api_call, db_call in lookups:
+        start = time.perf_counter()
+        api_result = api_call()
+        api_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        db_result = db_call()
+        db_ms = (time.perf_counter() - start) * 1000
+        log_call = log.info if str(api_result) == str(db_result) else log.error
+        log_call("Lookup compared", resource=name, api_id=api_result, api_ms=round(api_ms, 1),
+                 db_id=db_result, db_ms=round(db_ms, 2), match=str(api_result) == str(db_result))
+    reader.close()
+
+
+if __name__ == "__main__":
+    _compare_with_api()
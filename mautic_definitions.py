@@ -0,0 +1,215 @@
+"""Resources provisioned by the `create` command (mautic_create.py).
+
+Kept in one place so the create, cleanup and audit commands agree on
+what a correctly configured instance looks like.
+"""
+
+PROFISSAO_OPTIONS = [
+    {"label": "Educação Física", "value": "educacao_fisica"},
+    {"label": "Fisioterapia", "value": "fisioterapia"},
+    {"label": "Medicina Esportiva", "value": "medicina_esportiva"},
+    {"label": "Medicina", "value": "medicina"},
+    {"label": "Empreendedor", "value": "empreendedor"},
+    {"label": "Outro", "value": "outro"}
+]
+
+# Welcome email sequence, sent D+0, D+1 and D+2 after the form submission
+EMAIL_SEQUENCE = [
+    {
+        "name": "Bem-vindo ao Método Superare - D+0",
+        "subject": "Bem-vindo ao Método Superare! 🌟",
+        "content": """
+    <h2>Olá {contactfield=firstname}!</h2>
+    
+    <p>Seja bem-vindo ao <strong>Método Superare</strong>!</p>
+    
+    <p>Ficamos muito felizes em ter você conosco. O Método Superare é uma abordagem revolucionária que combina:</p>
+    
+    <ul>
+        <li>✅ Ciência do esporte de alto rendimento</li>
+        <li>✅ Metodologias comprovadas de reabilitação</li>
+        <li>✅ Estratégias de prevenção de lesões</li>
+        <li>✅ Desenvolvimento de performance atlética</li>
+    </ul>
+    
+    <p>Nos próximos dias, você receberá informações valiosas sobre como aplicar essas técnicas em sua prática profissional.</p>
+    
+    <p>Fique atento ao seu email!</p>
+    
+    <p>Atenciosamente,<br>
+    <strong>Equipe Superare</strong></p>
+    """,
+        "isPublished": True
+    },
+    {
+        "name": "Método Superare - Fundamentos - D+1",
+        "subject": "Os 3 Pilares do Método Superare 📚",
+        "content": """
+    <h2>Olá {contactfield=firstname}!</h2>
+    
+    <p>Hoje vamos falar sobre os <strong>3 Pilares Fundamentais</strong> do Método Superare:</p>
+    
+    <h3>🎯 Pilar 1: Avaliação Específica</h3>
+    <p>Identificamos as necessidades individuais de cada atleta ou paciente através de avaliações precisas e personalizadas.</p>
+    
+    <h3>⚡ Pilar 2: Treinamento Funcional</h3>
+    <p>Desenvolvemos programas de treinamento que simulam movimentos reais e melhoram a performance específica.</p>
+    
+    <h3>🛡️ Pilar 3: Prevenção Inteligente</h3>
+    <p>Implementamos estratégias proativas para prevenir lesões e otimizar a recuperação.</p>
+    
+    <p>Esses pilares formam a base de todo o nosso método. Amanhã você descobrirá como aplicá-los na prática!</p>
+    
+    <p>Atenciosamente,<br>
+    <strong>Equipe Superare</strong></p>
+    """,
+        "isPublished": True
+    },
+    {
+        "name": "Método Superare - Aplicação Prática - D+2",
+        "subject": "Como Aplicar o Método Superare na Prática 🚀",
+        "content": """
+    <h2>Olá {contactfield=firstname}!</h2>
+    
+    <p>Chegou o momento de colocar o <strong>Método Superare</strong> em ação!</p>
+    
+    <h3>🎯 Passo a Passo da Aplicação:</h3>
+    
+    <ol>
+        <li><strong>Avaliação Inicial:</strong> Identifique as necessidades específicas</li>
+        <li><strong>Planejamento:</strong> Desenvolva um programa personalizado</li>
+        <li><strong>Execução:</strong> Implemente o treinamento progressivo</li>
+        <li><strong>Monitoramento:</strong> Acompanhe os resultados</li>
+        <li><strong>Ajustes:</strong> Otimize baseado no feedback</li>
+    </ol>
+    
+    <h3>💡 Dica do Dia:</h3>
+    <p>Lembre-se: cada pessoa é única. O Método Superare se adapta às necessidades individuais, não o contrário.</p>
+    
+    <p>Você está pronto para transformar sua prática profissional!</p>
+    
+    <p>Atenciosamente,<br>
+    <strong>Equipe Superare</strong></p>
+    """,
+        "isPublished": True
+    },
+]
+
+PROFISSAO_FIELD = {
+    "label": "Profissão",
+    "alias": "profissao",
+    "type": "select",
+    "group": "core",
+    "object": "contact",
+    "properties": {
+        "list": PROFISSAO_OPTIONS
+    }
+}
+
+EMAIL_CATEGORY_NAME = "Semente Aquecimento"
+
+TAG_NAME = "Semente1"
+
+SEGMENT = {
+    "name": "Semente1",
+    "alias": "semente1",
+    "description": "Segmento para campanha Semente1",
+    "isPublished": True
+}
+
+CAMPAIGN_NAME = "LancamentoSemente1"
+
+FORM_NAME = "LeadLandingPageForm"
+FORM_ALIAS = "leadlandingpageform"
+
+
+def build_campaign(segment_id, first_email_id):
+    return {
+        "name": CAMPAIGN_NAME,
+        "description": "Campanha de lançamento para captura de leads",
+        "isPublished": True,
+        "sources": [
+            {
+                "type": "segment",
+                "id": segment_id
+            }
+        ],
+        "events": [
+            {
+                "name": "Send email (D+0)",
+                "type": "email.send",
+                "properties": {
+                    "email": first_email_id,
+                    "send_delay": 0
+                }
+            }
+        ]
+    }
+
+
+def build_form(campaign_id):
+    return {
+        "name": FORM_NAME,
+        "alias": FORM_ALIAS,
+        "formType": "campaign",
+        "isPublished": True,
+        "fields": [
+            {
+                "label": "Nome",
+                "type": "text",
+                "alias": "firstname",  # Maps to contact firstname field
+                "isRequired": True,
+                "validationMessage": "O campo Nome é obrigatório."
+            },
+            {
+                "label": "Email",
+                "type": "email",
+                "alias": "email",  # Maps to contact email field
+                "isRequired": True,
+                "validationMessage": "Por favor, insira um email válido."
+            },
+            {
+                "label": "Código do País",
+                "type": "text",
+                "alias": "country_code",  # Custom field for country code
+                "isRequired": True,
+                "properties": {
+                    "maxLength": 4
+                },
+                "validationMessage": "O código do país é obrigatório (ex: +55, +1, +44)."
+            },
+            {
+                "label": "Celular",
+                "type": "tel",
+                "alias": "mobile",  # Maps to contact mobile field
+                "isRequired": True,
+                "validationMessage": "O campo Celular é obrigatório."
+            },
+            {
+                "label": "Área de Atuação",
+                "type": "select",
+                "alias": "profissao",  # Maps to custom profession field
+                "isRequired": True,
+                "properties": {
+                    "list": PROFISSAO_OPTIONS
+                },
+                "validationMessage": "Por favor, selecione sua área de atuação."
+            }
+        ],
+        "actions": [
+            {
+                "name": "Add to campaign",
+                "type": "campaign.add",
+                "properties": {
+                    "campaign": campaign_id
+                }
+            },
+            {
+                "name": "Add tag",
+                "type": "contact.addtag",
+                "properties": {
+                    "tags": [TAG_NAME]
+                }
+            }
+        ]
+    }
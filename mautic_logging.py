@@ -0,0 +1,186 @@
+"""Structured logging shared by the Mautic provisioning scripts.
+
+Every record is emitted as one JSON line carrying the tenant, the script, the
+current step, the resource being touched and (for steps) the duration, so the
+output of many tenants running in parallel can be separated and ingested.
+
+Records are handed to a background thread through a queue and written to a
+buffered sink, so logging never blocks on stdout or a slow log file. The sink
+is flushed whenever the queue drains (and at least every FLUSH_INTERVAL during
+a burst), so a killed process loses at most the records still in flight.
+
+Environment variables:
+    MAUTIC_TENANT      tenant name (defaults to the MAUTIC_URL host)
+    MAUTIC_LOG_LEVEL   DEBUG, INFO, WARNING or ERROR (default INFO)
+    MAUTIC_LOG_FORMAT  json (default) or text for human-readable local runs
+    MAUTIC_LOG_FILE    append to this file instead of stdout
+"""
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+SINK_BUFFER_SIZE = 64 * 1024
+FLUSH_INTERVAL = 1.0
+STANDARD_KEYS = ("tenant", "script", "step", "resource", "duration_ms")
+
+_current_step = contextvars.ContextVar("mautic_log_step", default=None)
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "msg": record.getMessage(),
+        }
+        for key in STANDARD_KEYS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        prefix = " ".join(
+            f"{key}={getattr(record, key)}"
+            for key in ("tenant", "step", "resource", "duration_ms")
+            if getattr(record, key, None) is not None
+        )
+        message = record.getMessage()
+        fields = getattr(record, "fields", None)
+        if fields:
+            message += " " + json.dumps(fields, ensure_ascii=False, default=str)
+        return f"[{record.levelname.lower()}] {prefix} {message}" if prefix else f"[{record.levelname.lower()}] {message}"
+
+
+class BufferedSinkHandler(logging.StreamHandler):
+    """Write formatted records to a block-buffered stream.
+
+    Runs on the queue listener thread. Writes are batched while more records
+    are waiting in `log_queue`; the buffer is flushed once the queue drains, on
+    errors, after FLUSH_INTERVAL and when the listener stops.
+    """
+
+    def __init__(self, path=None, log_queue=None):
+        if path:
+            stream = open(path, "a", encoding="utf-8", buffering=SINK_BUFFER_SIZE)
+        else:
+            stream = open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=SINK_BUFFER_SIZE, closefd=False)
+        super().__init__(stream)
+        self.log_queue = log_queue
+        self.last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            now = time.monotonic()
+            if (record.levelno >= logging.ERROR or self.log_queue is None or self.log_queue.empty()
+                    or now - self.last_flush >= FLUSH_INTERVAL):
+                self.stream.flush()
+                self.last_flush = now
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.flush()
+        self.stream.close()
+        super().close()
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger adapter that turns keyword arguments into JSON fields.
+
+    `resource` is promoted to its own key; any other keyword becomes an extra
+    field on the record. The active step is tracked with `step()`.
+    """
+
+    def process(self, msg, kwargs):
+        fields = {
+            key: kwargs.pop(key)
+            for key in list(kwargs)
+            if key not in ("exc_info", "stack_info", "stacklevel", "extra")
+        }
+        extra = dict(self.extra)
+        extra["step"] = _current_step.get()
+        extra["resource"] = fields.pop("resource", None)
+        extra["duration_ms"] = fields.pop("duration_ms", None)
+        extra["fields"] = fields
+        kwargs["extra"] = extra
+        return msg, kwargs
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """Scope log records to a provisioning step and log its duration"""
+        token = _current_step.set(name)
+        start = time.perf_counter()
+        self.debug("Step started")
+        try:
+            yield self
+        except BaseException:
+            self.error("Step failed", duration_ms=round((time.perf_counter() - start) * 1000, 1))
+            raise
+        else:
+            self.info("Step finished", duration_ms=round((time.perf_counter() - start) * 1000, 1))
+        finally:
+            _current_step.reset(token)
+
+
+def default_tenant():
+    tenant = os.getenv("MAUTIC_TENANT")
+    if tenant:
+        return tenant
+    url = os.getenv("MAUTIC_URL")
+    if url:
+        return urlparse(url).hostname or url
+    return None
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def get_logger(script, tenant=None, level=None):
+    """Configure the shared asynchronous sink (once) and return a logger for `script`"""
+    global _listener
+    root = logging.getLogger("mautic")
+    if _listener is None:
+        log_queue = queue.SimpleQueue()
+        sink = BufferedSinkHandler(os.getenv("MAUTIC_LOG_FILE"), log_queue)
+        if os.getenv("MAUTIC_LOG_FORMAT", "json").lower() == "text":
+            sink.setFormatter(TextFormatter())
+        else:
+            sink.setFormatter(JsonFormatter())
+        root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+        root.propagate = False
+        _listener = logging.handlers.QueueListener(log_queue, sink)
+        _listener.start()
+        atexit.register(_stop_listener)
+    root.setLevel((level or os.getenv("MAUTIC_LOG_LEVEL", "INFO")).upper())
+    return StructuredLogger(
+        logging.getLogger(f"mautic.{script}"),
+        {"script": script, "tenant": tenant if tenant is not None else default_tenant()},
+    )
+
+
+def set_verbosity(level):
+    """Adjust verbosity at runtime, e.g. from a --verbose flag"""
+    logging.getLogger("mautic").setLevel(level.upper() if isinstance(level, str) else level)
@@ -0,0 +1,371 @@
+"""`segments-update` command: rebuild only the segments affected by contact changes.
+
+`cron/mautic` no longer runs a full `mautic:segments:update` every minute; the
+host cron installed by setup-dc.sh runs this command instead. It tracks the
+newest contact `dateModified` it has seen and only runs
+`mautic:segments:update --list-id=<id>` for filtered segments whose filter
+fields changed on some contact since the last run.
+"""
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from mautic_api import MauticApi
+
+# The console runs inside the cron container, which is capped at 256M in docker-compose.yml.
+# Run it as www-data like the image's own cron so it never leaves root-owned cache or log files.
+CONSOLE_SERVICE = "mautic_cron"
+DEFAULT_CONSOLE = f"docker compose exec -T -u www-data {CONSOLE_SERVICE} php /var/www/html/bin/console"
+DEFAULT_STATE_FILE = "segment-update-state.json"
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Rough sizing for mautic:segments:update: PHP + Symfony kernel baseline, plus the
+# hydrated lead rows Doctrine keeps per batch.
+PHP_BASELINE_MEMORY = 128 * 1024 * 1024
+MEMORY_PER_CONTACT = 256 * 1024
+MIN_BATCH_LIMIT = 50
+MAX_BATCH_LIMIT = 5000
+MAX_RUN_HISTORY = 100
+
+# Changed contacts are paged in to see which filter fields they touched; past this
+# many it is cheaper to treat every filter field as changed.
+CONTACTS_PAGE_SIZE = 200
+MAX_CHANGED_CONTACTS = 5000
+# Filter value fingerprints are kept for the most recently changed contacts only; a
+# contact that fell out counts as new (every tracked field changed) when it next changes.
+MAX_TRACKED_CONTACTS = 20000
+
+
+# --- State ---
+def load_state(state_file):
+    if not os.path.exists(state_file):
+        return {"contacts_high_water_mark": None, "segments": {}, "runs": []}
+    with open(state_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state_file, state):
+    # Write to a temp file first so a crash mid-write never loses the high-water mark
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, state_file)
+
+
+def parse_timestamp(value):
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+# --- Memory Sizing ---
+def detect_container_memory_limit(service):
+    """Return the memory limit of a compose service's container, or None when unlimited/unknown"""
+    try:
+        container = subprocess.run(["docker", "compose", "ps", "-q", service],
+                                   capture_output=True, text=True, check=True).stdout.split()
+        if not container:
+            return None
+        memory = subprocess.run(["docker", "inspect", "--format", "{{.HostConfig.Memory}}", container[0]],
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return int(memory) if memory.isdigit() and int(memory) > 0 else None
+
+
+def detect_memory_limit():
+    """Return this process's cgroup memory limit in bytes, or None when unlimited/unknown"""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value)
+    return None
+
+
+def parse_memory(value):
+    units = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+    value = value.strip().lower().rstrip("b")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def batch_limit_for_memory(memory_limit):
+    batch = (memory_limit - PHP_BASELINE_MEMORY) // MEMORY_PER_CONTACT
+    return max(MIN_BATCH_LIMIT, min(MAX_BATCH_LIMIT, batch))
+
+
+# --- Change Detection ---
+def as_list(entities):
+    if isinstance(entities, dict):
+        return list(entities.values())
+    return entities or []
+
+
+def newest_timestamp(contacts, newest):
+    for contact in contacts:
+        modified = contact.get('dateModified') or contact.get('dateAdded')
+        if modified and (newest is None or parse_timestamp(modified) > parse_timestamp(newest)):
+            newest = modified
+    return newest
+
+
+def get_contact_changes(api, since):
+    """Return (number of contacts changed since `since`, newest timestamp seen, the contacts)
+
+    dateModified only has second resolution, so contacts modified in the same second
+    as the mark are read again (`gte`); their unchanged fingerprints filter them out
+    later. New contacts have no dateModified yet and are matched on dateAdded.
+
+    The contacts are only returned when there are at most MAX_CHANGED_CONTACTS of
+    them; otherwise (and on the first run) the list is None.
+    """
+    endpoint = "contacts?limit=1&minimal=true&orderBy=date_modified&orderByDir=DESC"
+    where = ""
+    if since:
+        mark = quote(since)
+        where = (
+            "&where[0][expr]=orX"
+            f"&where[0][val][0][col]=dateModified&where[0][val][0][expr]=gte&where[0][val][0][val]={mark}"
+            f"&where[0][val][1][col]=dateAdded&where[0][val][1][expr]=gte&where[0][val][1][val]={mark}"
+        )
+    contacts_response = api.request(endpoint + where)
+    if contacts_response is None:
+        return None, since, None
+    total = int(contacts_response.get('total', 0))
+    newest = newest_timestamp(as_list(contacts_response.get('contacts')), since)
+    if not since or total > MAX_CHANGED_CONTACTS:
+        return total, newest, None
+
+    contacts = {}
+    start = 0
+    while start < total:
+        page = api.request(
+            f"contacts?start={start}&limit={CONTACTS_PAGE_SIZE}&orderBy=id&orderByDir=ASC{where}"
+        )
+        if page is None:
+            return None, since, None
+        entities = as_list(page.get('contacts'))
+        if not entities:
+            break
+        start += len(entities)
+        # A contact edited while paging can show up on two pages
+        contacts.update((str(contact.get('id')), contact) for contact in entities)
+    contacts = list(contacts.values())
+    return total, newest_timestamp(contacts, newest), contacts
+
+
+def filter_fields(segment):
+    return {flt.get('field') for flt in segment.get('filters') or [] if flt.get('field')}
+
+
+def fingerprint(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:10]
+
+
+def contact_filter_values(contact):
+    """Values a segment filter can match on: the contact fields plus tags, owner and stage"""
+    values = dict((contact.get('fields') or {}).get('all') or {})
+    values['tags'] = sorted(tag.get('tag') if isinstance(tag, dict) else tag for tag in contact.get('tags') or [])
+    owner = contact.get('owner')
+    values['owner_id'] = owner.get('id') if isinstance(owner, dict) else owner
+    stage = contact.get('stage')
+    values['stage'] = stage.get('id') if isinstance(stage, dict) else stage
+    return values
+
+
+def find_changed_fields(contacts, tracked_fields, known_values):
+    """Return (filter fields changed on any contact, updated per-contact fingerprints)
+
+    `known_values` holds the fingerprints of each contact's tracked fields as of the
+    last successful run. A contact without fingerprints counts as having changed
+    every tracked field, and so do filters on something the contact API does not
+    expose (e.g. behaviors or segment membership). Contacts whose fingerprints are
+    unchanged (re-read because of the inclusive mark) are left out of `updated`.
+    """
+    changed = set()
+    updated = {}
+    for contact in contacts:
+        contact_id = str(contact.get('id'))
+        values = contact_filter_values(contact)
+        known = known_values.get(contact_id)
+        fingerprints = {}
+        for field in tracked_fields:
+            if field not in values:
+                changed.add(field)
+                continue
+            fingerprints[field] = fingerprint(values[field])
+            if known is None or known.get(field) != fingerprints[field]:
+                changed.add(field)
+        if fingerprints != known:
+            updated[contact_id] = fingerprints
+    return changed, updated
+
+
+def remember_filter_values(known_values, updated_values):
+    """Merge `updated_values` in as the most recent entries and drop the oldest past MAX_TRACKED_CONTACTS"""
+    for contact_id, fingerprints in updated_values.items():
+        known_values.pop(contact_id, None)
+        known_values[contact_id] = fingerprints
+    for contact_id in list(known_values)[:max(0, len(known_values) - MAX_TRACKED_CONTACTS)]:
+        del known_values[contact_id]
+
+
+def get_segments(api):
+    segments_response = api.request("segments?limit=1000")
+    if not segments_response or 'lists' not in segments_response:
+        return None
+    lists = segments_response['lists']
+    if isinstance(lists, dict):
+        return list(lists.values())
+    return lists
+
+
+def find_affected_segments(segments, state, changed_fields, list_ids, full):
+    """Pick the dynamic segments whose membership can have changed since the last run
+
+    `changed_fields` is the set of filter fields changed on some contact, or None
+    when that is unknown and every segment has to be considered.
+    """
+    mark = parse_timestamp(state.get("contacts_high_water_mark"))
+    affected = []
+    for segment in segments:
+        segment_id = segment.get('id')
+        if list_ids and segment_id not in list_ids:
+            continue
+        # Segments without filters have manual membership; there is nothing to rebuild
+        if not segment.get('filters'):
+            continue
+        known = state["segments"].get(str(segment_id))
+        segment_modified = parse_timestamp(segment.get('dateModified'))
+        if full or known is None:
+            affected.append(segment)
+        elif changed_fields is None or filter_fields(segment) & changed_fields:
+            affected.append(segment)
+        elif segment_modified and mark and segment_modified > mark:
+            affected.append(segment)
+    return affected
+
+
+# --- Segment Rebuild ---
+AFFECTED_PATTERN = re.compile(r"(\d+)\s+contact\(s\)\s+affected")
+ADDED_REMOVED_PATTERN = re.compile(r"(\d+)\s+total\s+contact\(s\)\s+to\s+be\s+(?:added|removed)")
+
+
+def count_rows_touched(output):
+    affected = [int(n) for n in AFFECTED_PATTERN.findall(output)]
+    if affected:
+        return sum(affected)
+    return sum(int(n) for n in ADDED_REMOVED_PATTERN.findall(output))
+
+
+def rebuild_segment(log, console, segment_id, batch_limit, dry_run):
+    command = shlex.split(console) + [
+        "mautic:segments:update",
+        f"--list-id={segment_id}",
+        f"--batch-limit={batch_limit}",
+    ]
+    if dry_run:
+        log.info("[dry-run] Skipping console command", resource=f"segment:{segment_id}", command=command)
+        return 0, True
+    result = subprocess.run(command, capture_output=True, text=True)
+    output = result.stdout + result.stderr
+    if result.returncode != 0:
+        log.error("❌ Segment update failed", resource=f"segment:{segment_id}",
+                  exit_code=result.returncode, output=output)
+        return 0, False
+    return count_rows_touched(output), True
+
+
+def run(args, log):
+    api = MauticApi.from_env(log)
+    console = args.console or os.getenv("MAUTIC_CONSOLE", DEFAULT_CONSOLE)
+
+    if args.memory_limit:
+        memory_limit = parse_memory(args.memory_limit)
+    else:
+        # The console runs in the mautic_cron container, not in this process
+        if shlex.split(console)[0] == "docker":
+            detected = detect_container_memory_limit(CONSOLE_SERVICE)
+        else:
+            detected = detect_memory_limit()
+        memory_limit = detected or DEFAULT_MEMORY_LIMIT
+    batch_limit = args.batch_limit or batch_limit_for_memory(memory_limit)
+
+    state = load_state(args.state_file)
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.monotonic()
+
+    with log.step("detect_changes"):
+        since = state.get("contacts_high_water_mark")
+        changed_contacts, newest, contacts = get_contact_changes(api, since)
+        if changed_contacts is None:
+            log.error("❌ Failed to read contact changes", resource="contacts")
+            return 1
+        log.info("Contacts modified since high-water mark", resource="contacts",
+                 since=since, changed_contacts=changed_contacts)
+
+        segments = get_segments(api)
+        if segments is None:
+            log.error("❌ Failed to list segments", resource="segments")
+            return 1
+
+        known_values = state.setdefault("contact_filter_values", {})
+        tracked_fields = set().union(*(filter_fields(segment) for segment in segments))
+        if contacts is None:
+            changed_fields, updated_values = (None if changed_contacts else set()), {}
+        else:
+            changed_fields, updated_values = find_changed_fields(contacts, tracked_fields, known_values)
+        log.info("Filter fields changed", resource="contacts",
+                 changed_fields=sorted(changed_fields) if changed_fields is not None else "unknown")
+
+        affected = find_affected_segments(segments, state, changed_fields, set(args.list_id), args.full)
+
+    rows_by_segment = {}
+    failed = False
+    with log.step("update_segments"):
+        log.info("Updating affected segments", segments=len(affected), batch_limit=batch_limit)
+        for segment in affected:
+            segment_id = segment.get('id')
+            rows, ok = rebuild_segment(log, console, segment_id, batch_limit, args.dry_run)
+            if not ok:
+                failed = True
+                continue
+            rows_by_segment[str(segment_id)] = rows
+            state["segments"][str(segment_id)] = {"name": segment.get('name'), "last_run": started_at, "rows": rows}
+            log.info("✅ Segment updated", resource=f"segment:{segment_id}", name=segment.get('name'), rows=rows)
+
+    rows_touched = sum(rows_by_segment.values())
+    if not args.dry_run:
+        # Only advance the mark when every rebuild succeeded, otherwise the next run retries
+        if not failed:
+            state["contacts_high_water_mark"] = newest
+            remember_filter_values(known_values, updated_values)
+        state["runs"].append({
+            "started_at": started_at,
+            "duration_seconds": round(time.monotonic() - start, 3),
+            "changed_contacts": changed_contacts,
+            "batch_limit": batch_limit,
+            "segments": rows_by_segment,
+            "rows_touched": rows_touched,
+            "failed": failed,
+        })
+        state["runs"] = state["runs"][-MAX_RUN_HISTORY:]
+        save_state(args.state_file, state)
+
+    log.info("📊 Rows touched this run", rows_touched=rows_touched,
+             duration_ms=round((time.monotonic() - start) * 1000, 1))
+    return 1 if failed else 0
@@ -0,0 +1,514 @@
+"""`snapshot` command: copy a tenant's marketing assets to another instance.
+
+`snapshot export` streams the fields, categories, tags, segments, emails,
+campaigns and forms of an instance into a gzip-compressed JSON-lines file;
+`snapshot import` recreates them on another instance, remapping the IDs they
+reference and reusing what already exists there.
+"""
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from mautic_api import MauticApi, require_settings
+
+SNAPSHOT_VERSION = 1
+PAGE_SIZE = 100
+BATCH_SIZE = 50
+DEFAULT_WORKERS = 4
+# Writes hydrate and persist nested entities; allow more than the default read timeout
+WRITE_TIMEOUT = 60
+
+# Resources in dependency order: anything referenced by a later resource comes first.
+# (endpoint, response key for lists, response key for a single entity, natural key)
+RESOURCES = {
+    "fields": ("fields/contact", "fields", "field", "alias"),
+    "categories": ("categories", "categories", "category", "title"),
+    "tags": ("tags", "tags", "tag", "tag"),
+    "segments": ("segments", "lists", "list", "name"),
+    "emails": ("emails", "emails", "email", "name"),
+    "campaigns": ("campaigns", "campaigns", "campaign", "name"),
+    "forms": ("forms", "forms", "form", "name"),
+}
+
+# Segment filters whose values are IDs of other resources
+FILTER_REFERENCES = {
+    "tags": "tags",
+    "leadlist": "segments",
+    "lead_email_received": "emails",
+    "lead_email_sent": "emails",
+    "globalcategory": "categories",
+}
+
+# Segment filters on resources a snapshot does not carry; their IDs are kept as they are
+UNMAPPED_FILTER_REFERENCES = {
+    "stage": "stages",
+    "owner_id": "users",
+    "lead_asset_download": "assets",
+    "page_id": "pages",
+}
+
+# Campaign event properties holding IDs of other resources, by event type
+EVENT_REFERENCES = {
+    "email.send": {"email": "emails"},
+    "lead.changelist": {"addToLists": "segments", "removeFromLists": "segments"},
+    "lead.segments": {"segments": "segments"},
+    "campaign.addremovelead": {"addTo": "campaigns", "removeFrom": "campaigns"},
+}
+
+# Campaign event properties that cannot be remapped: forms are imported after campaigns
+# and the other resources are not part of a snapshot
+UNMAPPED_EVENT_REFERENCES = {
+    "form.submit": {"forms": "forms"},
+    "form.field_value": {"form": "forms"},
+    "stage.change": {"stage": "stages"},
+    "lead.changeowner": {"owner": "users"},
+    "asset.download": {"assets": "assets"},
+    "page.pagehit": {"pages": "pages"},
+}
+
+# Resources created through the /batch/new endpoint; campaigns and forms carry nested
+# events/fields/actions and are created one by one in parallel instead.
+BATCH_RESOURCES = ("categories", "tags", "segments", "emails")
+# Each new contact field is an ALTER TABLE on the leads table; concurrent ones deadlock
+# or time out, so fields are created one at a time.
+SEQUENTIAL_RESOURCES = ("fields",)
+
+# Server-managed keys that must not be sent back on create
+READ_ONLY_KEYS = {
+    "id", "dateAdded", "dateModified", "createdBy", "createdByUser", "modifiedBy",
+    "modifiedByUser", "checkedOut", "checkedOutBy", "checkedOutByUser", "publicPreview",
+    "readCount", "sentCount", "variantSentCount", "variantReadCount", "revision",
+    "variantParent", "variantChildren", "translationParent", "translationChildren",
+    "unsubscribeForm", "preferenceCenter", "assetAttachments", "dynamicContent",
+    "cachedHtml", "formAttributes", "inKioskMode", "renderStyle", "lists_count",
+}
+
+
+def api_from_args(args, log):
+    """Target instance from --url/--user/--password, defaulting to the MAUTIC_* settings"""
+    if args.url and args.user and args.password:
+        return MauticApi(args.url, args.user, args.password, log)
+    url, user, password = require_settings(log, "MAUTIC_URL", "MAUTIC_USER", "MAUTIC_PASSWORD")
+    return MauticApi(args.url or url, args.user or user, args.password or password, log)
+
+
+def iter_entities(api, resource):
+    endpoint, list_key, _, _ = RESOURCES[resource]
+    return api.iter_entities(endpoint, list_key, PAGE_SIZE)
+
+
+# --- Export ---
+def export_snapshot(api, log, path, resources):
+    counts = {}
+    with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+        header = {
+            "snapshot_version": SNAPSHOT_VERSION,
+            "source": api.url,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "resources": resources,
+        }
+        snapshot.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for resource in resources:
+            with log.step(f"export_{resource}"):
+                counts[resource] = 0
+                for entity in iter_entities(api, resource):
+                    snapshot.write(json.dumps({"type": resource, "data": entity}, ensure_ascii=False) + "\n")
+                    counts[resource] += 1
+                log.info("Exported", resource=resource, count=counts[resource])
+    return counts
+
+
+def read_snapshot(path):
+    entities = {resource: [] for resource in RESOURCES}
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+        header = json.loads(snapshot.readline())
+        if header.get("snapshot_version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {header.get('snapshot_version')}")
+        for line in snapshot:
+            record = json.loads(line)
+            entities[record["type"]].append(record["data"])
+    return header, entities
+
+
+# --- ID Remapping ---
+class UnmappedReference(Exception):
+    """An entity references something in the snapshot that has no ID on the target"""
+
+
+def ref_id(value):
+    """Return the ID of a reference that may be an ID or an embedded entity"""
+    if isinstance(value, dict):
+        return value.get("id")
+    return value
+
+
+def remap(id_map, resource, value):
+    old_id = ref_id(value)
+    if old_id is None:
+        return None
+    return id_map[resource].get(str(old_id))
+
+
+def remap_ids(id_map, resource, values, keep=()):
+    """Remap an ID or a list of IDs, raising UnmappedReference if any is missing"""
+    is_list = isinstance(values, list)
+    new_ids = []
+    for value in values if is_list else [values]:
+        new_id = value if value in keep else remap(id_map, resource, value)
+        if new_id is None:
+            raise UnmappedReference(f"{resource} {ref_id(value)}")
+        new_ids.append(new_id)
+    return new_ids if is_list else new_ids[0]
+
+
+def as_values(value):
+    if isinstance(value, dict) and "id" not in value:
+        value = list(value.values())
+    return value if isinstance(value, list) else [value]
+
+
+def segment_references(entity):
+    """IDs of other segments an entity's `leadlist` filters point at"""
+    return {
+        str(ref_id(value))
+        for segment_filter in entity.get("filters") or [] if segment_filter.get("field") == "leadlist"
+        for value in as_values((segment_filter.get("properties") or {}).get("filter", segment_filter.get("filter")))
+        if value not in (None, "")
+    }
+
+
+def campaign_events(entity):
+    events = entity.get("events") or []
+    return list(events.values()) if isinstance(events, dict) else events
+
+
+def campaign_references(entity):
+    """IDs of other campaigns a campaign's events move contacts to or from"""
+    return {
+        str(ref_id(value))
+        for event in campaign_events(entity) if event.get("type") == "campaign.addremovelead"
+        for key in ("addTo", "removeFrom")
+        for value in as_values((event.get("properties") or {}).get(key) or [])
+        if value != "this"
+    }
+
+
+# Resources whose entities reference other entities of the same resource
+SELF_REFERENCES = {
+    "segments": segment_references,
+    "campaigns": campaign_references,
+}
+
+
+def natural_key(resource, entity):
+    """Key used to match an entity with an existing one on the target"""
+    _, _, _, key = RESOURCES[resource]
+    # The same title may exist once per bundle (email, form, global...)
+    if resource == "categories":
+        return f"{entity.get('bundle')}:{entity.get('title')}"
+    return entity.get(key)
+
+
+def strip_read_only(entity):
+    return {key: value for key, value in entity.items() if key not in READ_ONLY_KEYS}
+
+
+def prepare_field(entity, id_map, log):
+    payload = strip_read_only(entity)
+    payload.pop("isFixed", None)
+    return payload
+
+
+def prepare_category(entity, id_map, log):
+    return strip_read_only(entity)
+
+
+def prepare_tag(entity, id_map, log):
+    return {"tag": entity["tag"], "description": entity.get("description")}
+
+
+def prepare_segment(entity, id_map, log):
+    payload = strip_read_only(entity)
+    if entity.get("category"):
+        payload["category"] = remap(id_map, "categories", entity["category"])
+    filters = []
+    for segment_filter in entity.get("filters") or []:
+        field = segment_filter.get("field")
+        if field in UNMAPPED_FILTER_REFERENCES:
+            log.warning("Segment filter references IDs that are not imported; check them on the target",
+                        resource=f"segments:{entity.get('name')}", field=field,
+                        references=UNMAPPED_FILTER_REFERENCES[field])
+        resource = FILTER_REFERENCES.get(field)
+        properties = dict(segment_filter.get("properties") or {})
+        if resource is None or properties.get("filter", segment_filter.get("filter")) in (None, "", []):
+            filters.append(segment_filter)
+            continue
+        # A filter on records that were not imported would silently match the wrong ones,
+        # and without it the segment would match too many: fail the segment instead
+        properties["filter"] = remap_ids(id_map, resource, properties.get("filter", segment_filter.get("filter")))
+        filters.append(dict(segment_filter, properties=properties, filter=properties["filter"]))
+    payload["filters"] = filters
+    return payload
+
+
+def prepare_email(entity, id_map, log):
+    payload = strip_read_only(entity)
+    if entity.get("category"):
+        payload["category"] = remap(id_map, "categories", entity["category"])
+    if entity.get("lists"):
+        payload["lists"] = [new_id for new_id in (remap(id_map, "segments", item) for item in entity["lists"]) if new_id]
+    return payload
+
+
+def prepare_campaign(entity, id_map, log):
+    payload = strip_read_only(entity)
+    if entity.get("category"):
+        payload["category"] = remap(id_map, "categories", entity["category"])
+    payload["lists"] = [
+        {"id": new_id} for new_id in (remap(id_map, "segments", item) for item in entity.get("lists") or []) if new_id
+    ]
+    if entity.get("sources"):
+        payload["sources"] = [
+            dict(source, id=remap(id_map, "segments", source.get("id")))
+            for source in entity["sources"]
+            if source.get("type") == "segment" and remap(id_map, "segments", source.get("id"))
+        ]
+    # Forms are imported after campaigns (their campaign.add actions need the new
+    # campaign IDs), so form sources cannot be resolved here and are dropped.
+    if entity.get("forms"):
+        log.warning("Dropping form sources from campaign", resource=f"campaigns:{entity.get('name')}",
+                    forms=[ref_id(form) for form in entity["forms"]])
+    payload["forms"] = []
+    # Campaign events reference each other (parent/children, canvas connections) by ID;
+    # new events take "new<old id>" placeholders that Mautic resolves on save.
+    source_events = campaign_events(entity)
+    event_ids = {str(event.get("id", index)): f"new{event.get('id', index)}" for index, event in enumerate(source_events)}
+    events = []
+    for index, event in enumerate(source_events):
+        new_event = strip_read_only(event)
+        new_event["id"] = event_ids[str(event.get("id", index))]
+        parent = ref_id(event.get("parent"))
+        new_event["parent"] = event_ids.get(str(parent)) if parent is not None else None
+        new_event.pop("children", None)
+        properties = dict(event.get("properties") or {})
+        event_type = event.get("type")
+        for key, resource in EVENT_REFERENCES.get(event_type, {}).items():
+            if properties.get(key) not in (None, "", []):
+                # "this" is the campaign being created; so is a reference to its own source ID
+                keep = ("this",) if resource == "campaigns" else ()
+                values = properties[key]
+                if resource == "campaigns":
+                    values = ["this" if str(value) == str(entity.get("id")) else value for value in as_values(values)]
+                properties[key] = remap_ids(id_map, resource, values, keep)
+        for key, resource in UNMAPPED_EVENT_REFERENCES.get(event_type, {}).items():
+            if properties.get(key) not in (None, "", []):
+                log.warning("Campaign event references IDs that are not remapped; check them on the target",
+                            resource=f"campaigns:{entity.get('name')}", event=event.get("name"),
+                            type=event_type, references=resource, ids=properties[key])
+        new_event["properties"] = properties
+        events.append(new_event)
+    payload["events"] = events
+    canvas = entity.get("canvasSettings")
+    if canvas:
+        def canvas_id(value):
+            return event_ids.get(str(value), value)
+        payload["canvasSettings"] = {
+            "nodes": [dict(node, id=canvas_id(node.get("id"))) for node in canvas.get("nodes", [])],
+            "connections": [
+                dict(connection, sourceId=canvas_id(connection.get("sourceId")),
+                     targetId=canvas_id(connection.get("targetId")))
+                for connection in canvas.get("connections", [])
+            ],
+        }
+    return payload
+
+
+def prepare_form(entity, id_map, log):
+    payload = strip_read_only(entity)
+    if entity.get("category"):
+        payload["category"] = remap(id_map, "categories", entity["category"])
+    payload["fields"] = [strip_read_only(field) for field in entity.get("fields") or []]
+    actions = []
+    for action in entity.get("actions") or []:
+        new_action = strip_read_only(action)
+        properties = dict(action.get("properties") or {})
+        if "campaign" in properties:
+            properties["campaign"] = remap(id_map, "campaigns", properties["campaign"])
+        if "email" in properties:
+            properties["email"] = remap(id_map, "emails", properties["email"])
+        new_action["properties"] = properties
+        actions.append(new_action)
+    payload["actions"] = actions
+    return payload
+
+
+PREPARE = {
+    "fields": prepare_field,
+    "categories": prepare_category,
+    "tags": prepare_tag,
+    "segments": prepare_segment,
+    "emails": prepare_email,
+    "campaigns": prepare_campaign,
+    "forms": prepare_form,
+}
+
+
+# --- Import ---
+def create_one(api, resource, payload):
+    endpoint, _, single_key, _ = RESOURCES[resource]
+    result = api.request(f"{endpoint}/new", "POST", payload, timeout=WRITE_TIMEOUT)
+    if not result:
+        return None
+    return (result.get(single_key) or {}).get("id")
+
+
+def by_index(values):
+    """Key a batch response list/object by input index as a string"""
+    if isinstance(values, list):
+        return {str(i): value for i, value in enumerate(values)}
+    return {str(key): value for key, value in (values or {}).items()}
+
+
+def create_batch(api, resource, payloads):
+    """Create payloads through /batch/new; returns new IDs in input order (None on failure)"""
+    endpoint, list_key, _, _ = RESOURCES[resource]
+    result = api.request(f"{endpoint}/batch/new", "POST", payloads, timeout=WRITE_TIMEOUT)
+    if not result or list_key not in result:
+        return None
+    # Entities are keyed by input index and failed ones are left out, so never pair by position
+    created = by_index(result[list_key])
+    status_codes = by_index(result.get("statusCodes"))
+    new_ids = []
+    for i in range(len(payloads)):
+        entity = created.get(str(i))
+        if entity and status_codes.get(str(i), 201) in (200, 201):
+            new_ids.append(entity.get("id"))
+        else:
+            new_ids.append(None)
+    return new_ids
+
+
+def dependency_waves(resource, pending):
+    """Split `pending` into waves that only reference entities of earlier waves
+
+    Entities caught in a reference cycle end up together in the last wave, where
+    preparing them fails on the references that are still unmapped.
+    """
+    references = SELF_REFERENCES.get(resource)
+    if references is None:
+        return [pending]
+    pending_ids = {str(entity["id"]) for entity in pending}
+    depends_on = {
+        str(entity["id"]): (references(entity) & pending_ids) - {str(entity["id"])} for entity in pending
+    }
+    waves = []
+    placed = set()
+    while len(placed) < len(pending):
+        wave = [entity for entity in pending if str(entity["id"]) not in placed
+                and depends_on[str(entity["id"])] <= placed]
+        if not wave:
+            wave = [entity for entity in pending if str(entity["id"]) not in placed]
+        placed.update(str(entity["id"]) for entity in wave)
+        waves.append(wave)
+    return waves
+
+
+def create_entities(api, resource, pending, payloads, workers):
+    """Create `payloads`; returns the new IDs in input order (None on failure)"""
+    new_ids = [None] * len(pending)
+    if resource in BATCH_RESOURCES:
+        batches = [range(i, min(i + BATCH_SIZE, len(pending))) for i in range(0, len(pending), BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda batch: create_batch(api, resource, [payloads[i] for i in batch]), batches)
+            for batch, batch_ids in zip(batches, results):
+                for i, new_id in zip(batch, batch_ids or [None] * len(batch)):
+                    new_ids[i] = new_id
+    # Anything not created in a batch (or not batchable) is created individually in parallel.
+    # A batch whose response was lost may still have created its entities, so look again first.
+    retry = [i for i, new_id in enumerate(new_ids) if new_id is None]
+    if retry and resource in BATCH_RESOURCES:
+        existing = {natural_key(resource, entity): entity.get("id") for entity in iter_entities(api, resource)}
+        for i in retry:
+            new_ids[i] = existing.get(natural_key(resource, pending[i]))
+        retry = [i for i in retry if new_ids[i] is None]
+    if resource in SEQUENTIAL_RESOURCES:
+        workers = 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i, new_id in zip(retry, executor.map(lambda i: create_one(api, resource, payloads[i]), retry)):
+            new_ids[i] = new_id
+    return new_ids
+
+
+def import_resource(api, log, resource, entities, id_map, workers):
+    existing = {natural_key(resource, entity): entity.get("id") for entity in iter_entities(api, resource)}
+
+    pending = []
+    for entity in entities:
+        key = natural_key(resource, entity)
+        if key in existing:
+            id_map[resource][str(entity["id"])] = existing[key]
+            log.info("Already exists", resource=f"{resource}:{key}", id=existing[key])
+        else:
+            pending.append(entity)
+
+    failed = 0
+    # Entities referencing others of the same resource are created after them, so the
+    # references can be remapped
+    for wave in dependency_waves(resource, pending):
+        prepared = []
+        payloads = []
+        for entity in wave:
+            try:
+                payloads.append(PREPARE[resource](entity, id_map, log))
+            except UnmappedReference as e:
+                failed += 1
+                log.error(f"❌ Not created: references {e}, which has no ID on the target",
+                          resource=f"{resource}:{natural_key(resource, entity)}")
+                continue
+            prepared.append(entity)
+        for entity, new_id in zip(prepared, create_entities(api, resource, prepared, payloads, workers)):
+            key = natural_key(resource, entity)
+            if new_id is None:
+                failed += 1
+                log.error("❌ Failed to create", resource=f"{resource}:{key}")
+                continue
+            id_map[resource][str(entity["id"])] = new_id
+            log.info("✅ Created", resource=f"{resource}:{key}", id=new_id, source_id=entity["id"])
+    return len(pending) - failed, failed
+
+
+def import_snapshot(api, log, path, workers):
+    header, entities = read_snapshot(path)
+    log.info("Importing snapshot", source=header.get("source"), created_at=header.get("created_at"))
+    id_map = {resource: {} for resource in RESOURCES}
+    total_failed = 0
+    for resource in RESOURCES:
+        if not entities[resource]:
+            continue
+        with log.step(f"import_{resource}"):
+            created, failed = import_resource(api, log, resource, entities[resource], id_map, workers)
+            total_failed += failed
+            log.info("Imported", resource=resource, created=created, failed=failed,
+                     total=len(entities[resource]))
+    return id_map, total_failed
+
+
+def run(args, log):
+    api = api_from_args(args, log)
+
+    if args.action == "export":
+        resources = [resource for resource in RESOURCES if not args.resource or resource in args.resource]
+        counts = export_snapshot(api, log, args.snapshot, resources)
+        log.info("✅ Snapshot exported", resource=args.snapshot, counts=counts)
+        return 0
+
+    id_map, failed = import_snapshot(api, log, args.snapshot, args.workers or DEFAULT_WORKERS)
+    if args.id_map:
+        with open(args.id_map, "w", encoding="utf-8") as f:
+            json.dump(id_map, f, indent=2)
+    if failed:
+        log.error("❌ Snapshot import finished with failures", resource=args.snapshot, failed=failed)
+        return 1
+    log.info("✅ Snapshot imported", resource=args.snapshot)
+    return 0
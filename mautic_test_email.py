@@ -0,0 +1,102 @@
+"""`test-email` command: send a test email to verify the SendGrid setup."""
+import os
+
+from mautic_api import MauticApi
+
+EMAIL_CONFIG_VARS = {
+    "mailer_from_name": "MAUTIC_MAILER_FROM_NAME",
+    "mailer_from_email": "MAUTIC_MAILER_FROM_EMAIL",
+    "mailer_transport": "MAUTIC_MAILER_TRANSPORT",
+    "mailer_host": "MAUTIC_MAILER_HOST",
+    "mailer_port": "MAUTIC_MAILER_PORT",
+    "mailer_user": "MAUTIC_MAILER_USER",
+    "mailer_password": "MAUTIC_MAILER_PASSWORD",
+    "mailer_encryption": "MAUTIC_MAILER_ENCRYPTION",
+    "mailer_auth_mode": "MAUTIC_MAILER_AUTH_MODE",
+}
+
+TEST_EMAIL = {
+    "name": "Test SendGrid Configuration",
+    "subject": "Test Email via SendGrid",
+    "content": """
+        <h2>SendGrid Test Email</h2>
+        <p>Hello {contactfield=firstname}!</p>
+        <p>This is a test email to verify your SendGrid configuration in Mautic.</p>
+        <p>If you receive this email, your SendGrid setup is working correctly!</p>
+        <p><strong>SendGrid Configuration:</strong></p>
+        <ul>
+            <li>Host: smtp.sendgrid.net</li>
+            <li>Port: 587</li>
+            <li>Encryption: TLS</li>
+            <li>From: Método Superare</li>
+        </ul>
+        <p>Test completed successfully!</p>
+        """,
+    "isPublished": True
+}
+
+
+def log_email_config(log):
+    masked_config = {}
+    for key, env_var in EMAIL_CONFIG_VARS.items():
+        value = os.getenv(env_var)
+        if value is not None and "password" in key.lower():
+            masked_config[key] = '*' * len(value)
+        else:
+            masked_config[key] = value
+    log.info("📧 Current Email Configuration from Environment", email_config=masked_config)
+
+
+def send_test_email(api, log, recipient, mobile):
+    # Create a test contact first
+    test_contact_data = {
+        "firstname": "Adilson",
+        "lastname": "Jardim",
+        "email": recipient,
+        "mobile": mobile
+    }
+    contact_result = api.request("contacts/new", "POST", test_contact_data)
+    if not contact_result:
+        log.error("❌ Failed to create test contact", resource=f"contact:{recipient}")
+        return False
+    contact_id = contact_result.get('contact', {}).get('id')
+    log.info("✅ Test contact created", resource=f"contact:{recipient}", id=contact_id)
+
+    test_email_result = api.request("emails/new", "POST", TEST_EMAIL)
+    if not test_email_result:
+        log.error("❌ Failed to create test email", resource=f"email:{TEST_EMAIL['name']}")
+        return False
+    test_email_id = test_email_result.get('email', {}).get('id')
+    log.info("✅ Test email created", resource=f"email:{TEST_EMAIL['name']}", id=test_email_id)
+
+    # Send the test email to the test contact
+    send_result = api.request("emails/send", "POST", {"email": test_email_id, "contact": contact_id})
+    if not send_result:
+        log.error("❌ Failed to send test email. This might indicate a SendGrid configuration issue",
+                  resource=f"email:{test_email_id}", recipient=recipient)
+        return False
+    log.info(
+        "✅ Test email sent successfully! Check the SendGrid dashboard and Mautic email logs for delivery status",
+        resource=f"email:{test_email_id}",
+        recipient=recipient,
+    )
+    return True
+
+
+def run(args, log):
+    api = MauticApi.from_env(log)
+    log.info("Using Mautic instance", url=api.url)
+    log_email_config(log)
+    with log.step("send_test_email"):
+        send_test_email(
+            api, log,
+            recipient=os.getenv("EMAIL_ADDRESS", "chicoria@gmail.com"),
+            mobile=os.getenv("MOBILE_NUMBER", "+351915787088"),
+        )
+    log.info("🎯 Next Steps", next_steps=[
+        "If you did not receive the test email, check your SendGrid and Mautic logs.",
+        "Make sure your .mautic_env and docker-compose.yml have the correct email settings.",
+        "Restart your Mautic containers after changing environment variables.",
+        "For further troubleshooting, check the Mautic UI email settings and logs.",
+    ])
+    return 0
@@ -0,0 +1,518 @@
+"""`webhook-serve` / `webhook-bench` commands: receive Mautic webhooks and forward them downstream.
+
+Mautic POSTs form submissions (and other events) to the receiver, signed with
+the webhook secret in the `Webhook-Signature` header (base64 HMAC-SHA256 of
+the body). Each verified payload is appended to a local spool file and
+fsynced before the receiver answers 202, so an accepted event survives a
+crash. A delivery task reads the spool in order and POSTs batches to the
+downstream URL, advancing a persisted offset only after the batch succeeded.
+Events the downstream rejects outright (a 4xx other than 408/425/429) are
+moved to a dead-letter file in the spool directory instead of blocking the
+queue.
+
+Backpressure: appends go through a bounded queue that is group-committed
+(one fsync per batch of writes), and once more than `max_pending` events wait
+for delivery the receiver answers 503 with Retry-After instead of growing the
+spool without bound. Nothing that got a 202 is ever dropped.
+
+Only the standard library is used so the receiver can run on the droplet
+without extra packages.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import signal
+import time
+
+MAX_BODY_BYTES = 1024 * 1024
+WRITE_QUEUE_SIZE = 1024
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_BATCH_WAIT = 1.0
+DEFAULT_MAX_PENDING = 100_000
+COMPACT_BYTES = 64 * 1024 * 1024
+RETRY_BACKOFF_MAX = 60.0
+
+SIGNATURE_HEADER = "webhook-signature"
+# 4xx responses worth retrying; any other 4xx rejects the events for good
+RETRYABLE_STATUS = {408, 425, 429}
+
+
+def sign(body, secret):
+    """Signature Mautic sends for `body`: base64(HMAC-SHA256(body, secret))"""
+    return base64.b64encode(hmac.new(secret.encode(), body, hashlib.sha256).digest()).decode()
+
+
+def verify_signature(body, secret, signature):
+    return bool(signature) and hmac.compare_digest(sign(body, secret), signature)
+
+
+class Spool:
+    """Append-only JSON-lines queue on disk with a persisted delivery position
+
+    The position file holds "<generation> <byte offset>". Once everything has
+    been delivered and the file is large, appends move to the next generation's
+    file: the new position is persisted before the old file is removed, so
+    after a crash at any point the saved position matches its file.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.offset_path = os.path.join(directory, "webhooks.offset")
+        self.dead_letter_path = os.path.join(directory, "webhooks.dead.jsonl")
+        self.generation, self.delivered_offset = self._read_position()
+        self._remove_other_generations()
+        self._drop_torn_tail()
+        self.file = open(self.path, "ab")
+        self.pending = self._count_pending()
+        self.dead_lettered = 0
+        self.lock = asyncio.Lock()
+        self.appended = asyncio.Event()
+        self._writes = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+
+    def _generation_path(self, generation):
+        return os.path.join(self.directory, f"webhooks.{generation}.jsonl")
+
+    @property
+    def path(self):
+        return self._generation_path(self.generation)
+
+    def _read_position(self):
+        try:
+            with open(self.offset_path) as f:
+                generation, offset = f.read().split()
+        except FileNotFoundError:
+            return 0, 0
+        return int(generation), int(offset)
+
+    def _save_position(self, generation, offset):
+        tmp_path = f"{self.offset_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f"{generation} {offset}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.offset_path)
+
+    def _remove_other_generations(self):
+        # Left by a crash during rotation: the older file was fully delivered and
+        # the newer one was never written to
+        for name in os.listdir(self.directory):
+            match = re.fullmatch(r"webhooks\.(\d+)\.jsonl", name)
+            if match and int(match.group(1)) != self.generation:
+                os.remove(os.path.join(self.directory, name))
+
+    def _drop_torn_tail(self):
+        """Cut a final line without newline: a write interrupted by a crash, never acknowledged"""
+        try:
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    f.truncate(data.rfind(b"\n") + 1)
+        except FileNotFoundError:
+            pass
+
+    def _count_pending(self):
+        with open(self.path, "rb") as f:
+            f.seek(self.delivered_offset)
+            return sum(1 for _ in f)
+
+    async def append(self, payload):
+        """Queue one payload and wait until it is on disk"""
+        line = json.dumps({"received_at": time.time(), "payload": payload}, ensure_ascii=False).encode() + b"\n"
+        done = asyncio.get_running_loop().create_future()
+        await self._writes.put((line, done))
+        await done
+
+    async def writer(self):
+        """Group commit: write everything queued so far, fsync once, then acknowledge"""
+        while True:
+            batch = [await self._writes.get()]
+            while not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            async with self.lock:
+                size = self.file.tell()
+                try:
+                    self.file.write(b"".join(line for line, _ in batch))
+                    self.file.flush()
+                    await asyncio.to_thread(os.fsync, self.file.fileno())
+                except OSError as e:
+                    # Nothing in the batch is acknowledged, so do not leave half of it behind
+                    self.file.truncate(size)
+                    for _, done in batch:
+                        done.set_exception(e)
+                    continue
+            self.pending += len(batch)
+            for _, done in batch:
+                done.set_result(None)
+            self.appended.set()
+
+    def read_batch(self, max_records):
+        """Return (records, undecodable lines, end offset) for up to `max_records` undelivered lines"""
+        records = []
+        bad_lines = []
+        with open(self.path, "rb") as f:
+            f.seek(self.delivered_offset)
+            end = self.delivered_offset
+            for line in f:
+                end += len(line)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    bad_lines.append(line.decode("utf-8", "replace"))
+                if len(records) + len(bad_lines) >= max_records:
+                    break
+        return records, bad_lines, end
+
+    def dead_letter(self, entries):
+        """Append entries that can never be delivered to the dead-letter file"""
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(dict(entry, failed_at=time.time()), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.dead_lettered += len(entries)
+
+    def _rotate(self):
+        """Move appends to the next generation; only called once everything is delivered"""
+        old_path = self.path
+        new_file = open(self._generation_path(self.generation + 1), "ab")
+        self._save_position(self.generation + 1, 0)
+        self.file.close()
+        self.file = new_file
+        self.generation += 1
+        self.delivered_offset = 0
+        os.remove(old_path)
+
+    async def mark_delivered(self, count, offset):
+        async with self.lock:
+            await asyncio.to_thread(self._save_position, self.generation, offset)
+            self.delivered_offset = offset
+            self.pending -= count
+            # Everything delivered: start a fresh file instead of growing this one forever
+            if self.pending == 0 and offset >= COMPACT_BYTES:
+                await asyncio.to_thread(self._rotate)
+
+
+class PermanentDeliveryError(Exception):
+    """Downstream rejected the request; sending the same events again cannot succeed"""
+
+
+class HttpSink:
+    """POST each batch as a JSON array to the downstream URL"""
+
+    def __init__(self, url, token=None, timeout=30):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+
+    def _post(self, body):
+        import urllib.error
+        import urllib.request
+
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            if 400 <= e.code < 500 and e.code not in RETRYABLE_STATUS:
+                raise PermanentDeliveryError(f"HTTP {e.code} {e.reason}") from e
+            raise
+
+    async def send(self, records):
+        body = json.dumps([record["payload"] for record in records], ensure_ascii=False).encode()
+        await asyncio.to_thread(self._post, body)
+
+
+class FileSink:
+    """Append batches to a local JSON-lines file (used by the benchmark and for dry runs)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.delivered = 0
+
+    def _write(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record["payload"], ensure_ascii=False) + "\n")
+
+    async def send(self, records):
+        await asyncio.to_thread(self._write, records)
+        self.delivered += len(records)
+
+
+async def send_batch(spool, sink, log, records):
+    """Send a batch; events downstream rejects for good go to the dead-letter file instead of blocking the queue"""
+    try:
+        await sink.send(records)
+        return
+    except PermanentDeliveryError as e:
+        if len(records) == 1:
+            rejected = [(records[0], e)]
+        else:
+            # Find the rejected events one at a time so the rest of the batch still goes through
+            rejected = []
+            for record in records:
+                try:
+                    await sink.send([record])
+                except PermanentDeliveryError as record_error:
+                    rejected.append((record, record_error))
+    if rejected:
+        log.error("Downstream rejected events, moved them to the dead-letter file", resource="downstream",
+                  events=len(rejected), error=str(rejected[0][1]))
+        await asyncio.to_thread(spool.dead_letter, [{"error": str(error), "record": record}
+                                                    for record, error in rejected])
+
+
+async def deliver(spool, sink, log, batch_size, batch_wait):
+    """Forward spooled payloads downstream in order, retrying a failed batch with backoff"""
+    backoff = 1.0
+
+    async def retry_later(message, **fields):
+        nonlocal backoff
+        log.error(message, retry_in=backoff, **fields)
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+
+    while True:
+        if spool.pending == 0:
+            spool.appended.clear()
+            await spool.appended.wait()
+        # Give a burst a moment to fill the batch instead of sending one event at a time
+        if spool.pending < batch_size:
+            await asyncio.sleep(batch_wait)
+        try:
+            records, bad_lines, end = await asyncio.to_thread(spool.read_batch, batch_size)
+        except OSError as e:
+            await retry_later(f"Reading the spool failed: {e}", resource=spool.path)
+            continue
+        try:
+            if records:
+                await send_batch(spool, sink, log, records)
+        except Exception as e:
+            # At-least-once: a batch that partly went through one by one is sent again
+            await retry_later(f"Downstream delivery failed: {e}", resource="downstream", batch=len(records))
+            continue
+        if bad_lines:
+            log.error("Moved undecodable spool lines to the dead-letter file", resource=spool.path,
+                      lines=len(bad_lines))
+            await asyncio.to_thread(spool.dead_letter, [{"error": "undecodable spool line", "line": line}
+                                                        for line in bad_lines])
+        backoff = 1.0
+        await spool.mark_delivered(len(records) + len(bad_lines), end)
+        log.debug("Delivered batch", resource="downstream", batch=len(records), pending=spool.pending)
+
+
+class WebhookReceiver:
+    """Minimal HTTP/1.1 server: POST <path> takes webhooks, GET /health reports queue state"""
+
+    def __init__(self, spool, secret, log, path="/webhooks/mautic", max_pending=DEFAULT_MAX_PENDING):
+        self.spool = spool
+        self.secret = secret
+        self.log = log
+        self.path = path
+        self.max_pending = max_pending
+        self.accepted = 0
+        self.rejected = 0
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload, extra_headers = await self._dispatch(method, path, headers, body)
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                self._respond(writer, status, payload, extra_headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError("request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body
+
+    async def _dispatch(self, method, path, headers, body):
+        if method == "GET" and path == "/health":
+            return 200, {"pending": self.spool.pending, "accepted": self.accepted, "rejected": self.rejected,
+                         "dead_lettered": self.spool.dead_lettered}, {}
+        if method != "POST" or path != self.path:
+            return 404, {"error": "not found"}, {}
+        if not verify_signature(body, self.secret, headers.get(SIGNATURE_HEADER)):
+            self.rejected += 1
+            self.log.warning("Rejected webhook with invalid signature", resource="webhook")
+            return 401, {"error": "invalid signature"}, {}
+        if self.spool.pending >= self.max_pending:
+            # Downstream is behind; ask Mautic to retry later rather than spooling without bound
+            return 503, {"error": "queue full"}, {"Retry-After": "30"}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {"error": "invalid JSON"}, {}
+        await self.spool.append(payload)
+        self.accepted += 1
+        return 202, {"status": "queued"}, {}
+
+    @staticmethod
+    def _respond(writer, status, payload, extra_headers, keep_alive):
+        reasons = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+                   503: "Service Unavailable"}
+        body = json.dumps(payload).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+            **extra_headers,
+        }
+        head = f"HTTP/1.1 {status} {reasons[status]}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+
+
+async def start(args, log, sink):
+    """Start the spool writer, the delivery task and the HTTP server"""
+    spool = Spool(args.spool_dir)
+    receiver = WebhookReceiver(spool, args.secret, log, path=args.path, max_pending=args.max_pending)
+    tasks = [
+        asyncio.create_task(spool.writer()),
+        asyncio.create_task(deliver(spool, sink, log, args.batch_size, args.batch_wait)),
+    ]
+    server = await asyncio.start_server(receiver.handle, args.host, args.port)
+    return spool, receiver, server, tasks
+
+
+def serve(args, log):
+    secret = args.secret or os.getenv("MAUTIC_WEBHOOK_SECRET")
+    downstream = args.downstream or os.getenv("WEBHOOK_DOWNSTREAM_URL")
+    if not secret or not downstream:
+        log.error("Missing webhook settings. Please set MAUTIC_WEBHOOK_SECRET and WEBHOOK_DOWNSTREAM_URL")
+        return 1
+    args.secret = secret
+    if downstream.startswith("file:"):
+        sink = FileSink(downstream[len("file:"):])
+    else:
+        sink = HttpSink(downstream, token=os.getenv("WEBHOOK_DOWNSTREAM_TOKEN"))
+
+    async def main():
+        spool, _, server, tasks = await start(args, log, sink)
+        log.info("Webhook receiver listening", resource=f"{args.host}:{args.port}{args.path}",
+                 pending=spool.pending)
+        # SIGTERM (systemd, docker stop) ends the loop normally so atexit flushes the log sink;
+        # accepted events are already in the spool and are delivered on the next start
+        stopping = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+        stop = asyncio.create_task(stopping.wait())
+        async with server:
+            tasks.append(asyncio.create_task(server.serve_forever()))
+            # None of these finish on their own; if one does, stop instead of accepting
+            # events that are never written or delivered
+            done, _ = await asyncio.wait(tasks + [stop], return_when=asyncio.FIRST_COMPLETED)
+            for task in done - {stop}:
+                error = None if task.cancelled() else task.exception()
+                log.error(f"Webhook receiver task stopped: {error!r}", resource=task.get_coro().__name__)
+            for task in tasks + [stop]:
+                task.cancel()
+        if stop in done:
+            log.info("Webhook receiver stopped", pending=spool.pending)
+            return 0
+        return 1
+
+    try:
+        return asyncio.run(main())
+    except KeyboardInterrupt:
+        return 0
+
+
+def bench(args, log):
+    """Fire signed form submissions at an in-process receiver and check every one is delivered"""
+    import tempfile
+
+    async def post(host, port, body, secret, count):
+        reader, writer = await asyncio.open_connection(host, port)
+        head = (
+            f"POST {args.path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n{SIGNATURE_HEADER}: {sign(body, secret)}\r\n\r\n"
+        ).encode()
+        statuses = []
+        for _ in range(count):
+            writer.write(head + body)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            statuses.append(int(status_line.split()[1]))
+        writer.close()
+        return statuses
+
+    async def main(spool_dir):
+        args.spool_dir = spool_dir
+        args.secret = "benchmark-secret"
+        args.host, args.port = "127.0.0.1", 0
+        sink = FileSink(os.path.join(spool_dir, "downstream.jsonl"))
+        spool, receiver, server, tasks = await start(args, log, sink)
+        port = server.sockets[0].getsockname()[1]
+        body = json.dumps({"mautic.form_on_submit": [{"submission": {
+            "form": {"alias": "leadlandingpageform"},
+            "results": {"firstname": "Lead", "email": "lead@example.com", "mobile": "+5511999999999",
+                        "country_code": "+55", "profissao": "fisioterapia"},
+        }}]}).encode()
+
+        per_connection = args.requests // args.concurrency
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(
+            post("127.0.0.1", port, body, args.secret, per_connection) for _ in range(args.concurrency)
+        ))
+        accept_seconds = time.perf_counter() - start_time
+        accepted = sum(status == 202 for statuses in results for status in statuses)
+        while spool.pending:
+            await asyncio.sleep(0.05)
+        total_seconds = time.perf_counter() - start_time
+        server.close()
+        for task in tasks:
+            task.cancel()
+        return accepted, per_connection * args.concurrency, sink.delivered, accept_seconds, total_seconds
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        accepted, sent, delivered, accept_seconds, total_seconds = asyncio.run(main(spool_dir))
+    ok = accepted == sent == delivered
+    log_call = log.info if ok else log.error
+    log_call("Webhook benchmark", sent=sent, accepted=accepted, delivered=delivered,
+             concurrency=args.concurrency, accept_per_second=round(accepted / accept_seconds),
+             end_to_end_per_minute=round(delivered / total_seconds * 60))
+    return 0 if ok else 1
+
+
+def run(args, log):
+    if args.command == "webhook-bench":
+        return bench(args, log)
+    return serve(args, log)
@@ -83,6 +83,36 @@ else
     log_success "Mautic installation completed"
 fi
 
+# Segments are rebuilt from the host by `mautic_cli.py segments-update` instead of a
+# full mautic:segments:update every minute inside mautic_cron
+log_info "Installing cron schedules..."
+cp /var/www/cron/mautic /mnt/do-volume/cron/mautic
+# segments-update reads its API credentials from /var/www/.mautic_env: the admin installed above, on the local port
+sed -i '/^MAUTIC_URL=/d;/^MAUTIC_USER=/d;/^MAUTIC_PASSWORD=/d' /var/www/.mautic_env
+cat >> /var/www/.mautic_env <<'ENV'
+MAUTIC_URL="http://localhost:{{PORT}}"
+MAUTIC_USER="{{EMAIL_ADDRESS}}"
+MAUTIC_PASSWORD="{{MAUTIC_PASSWORD}}"
+ENV
+chmod 600 /var/www/.mautic_env
+cat > /etc/cron.d/mautic-segment-update <<'CRON'
+* * * * * root cd /var/www && flock -n /tmp/mautic-segment-update.lock python3 mautic_cli.py segments-update >> /var/log/mautic-segment-update.log 2>&1
+30 3 * * * root cd /var/www && flock /tmp/mautic-segment-update.lock python3 mautic_cli.py segments-update --full >> /var/log/mautic-segment-update.log 2>&1
+CRON
+log_success "Cron schedules installed"
+
+# The webhook receiver only runs once its secret and downstream are configured in .mautic_env
+log_info "Installing webhook receiver service..."
+cp /var/www/mautic-webhook.service /etc/systemd/system/mautic-webhook.service
+systemctl daemon-reload
+if grep -q '^MAUTIC_WEBHOOK_SECRET=.' /var/www/.mautic_env && grep -q '^WEBHOOK_DOWNSTREAM_URL=.' /var/www/.mautic_env; then
+    systemctl enable mautic-webhook
+    systemctl restart mautic-webhook
+    log_success "Webhook receiver started"
+else
+    log_info "MAUTIC_WEBHOOK_SECRET/WEBHOOK_DOWNSTREAM_URL not set in .mautic_env, webhook receiver not started"
+fi
+
 log_info "Starting all containers"
 log_info "=== Starting Docker Compose Up ==="
 docker compose up -d 2>&1 | tee -a /var/log/docker_build.log
@@ -22,7 +22,7 @@ sudo ufw allow out 587/tcp
 
 # Install Nginx
 sudo apt-get update
-sudo apt-get install -y nginx vim nano
+sudo apt-get install -y nginx vim nano python3-requests python3-dotenv
 
 # Create mount points for DigitalOcean Block Storage
 sudo mkdir -p /mnt/do-volume